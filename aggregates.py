@@ -0,0 +1,434 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+import athlete_index
+
+MEDALS = ['Gold', 'Silver', 'Bronze']
+SEXES = ['M', 'F']
+
+
+@dataclass(frozen=True)
+class MedalCube:
+    """Dense Year x Region x Medal counts built from the medal fact table"""
+    years: list
+    regions: list
+    counts: np.ndarray  # shape (len(years), len(regions), 3)
+
+
+def build_medal_cube(medals):
+    """
+    Build the medal tally cube
+
+    Parameters:
+        medals (pandas.DataFrame): Medal fact table from preprocessor.medal_events()
+
+    Returns:
+        MedalCube: Counts per edition, region and medal type
+    """
+    years = np.sort(medals['Year'].unique())
+    regions = np.sort(medals['region'].astype(str).unique())
+
+    year_idx = np.searchsorted(years, medals['Year'].to_numpy())
+    region_idx = np.searchsorted(regions, medals['region'].astype(str).to_numpy())
+    medal_idx = np.select(
+        [medals[m].to_numpy(dtype=bool) for m in MEDALS], [0, 1, 2], default=-1
+    )
+
+    # Flatten (year, region, medal) into one index and count in a single pass
+    shape = (len(years), len(regions), len(MEDALS))
+    valid = medal_idx >= 0
+    flat = np.ravel_multi_index((year_idx[valid], region_idx[valid], medal_idx[valid]), shape)
+    counts = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape).astype(np.int32)
+
+    return MedalCube(years=[int(y) for y in years], regions=regions.tolist(), counts=counts)
+
+
+def merge_medal_cubes(cube, delta):
+    """
+    Add one cube's counts to another, e.g. a new edition's medals to history
+
+    Parameters:
+        cube (MedalCube): Existing cube
+        delta (MedalCube): Cube of the added medal rows
+
+    Returns:
+        MedalCube: Same as build_medal_cube() over both medal tables
+    """
+    years = sorted(set(cube.years) | set(delta.years))
+    regions = sorted(set(cube.regions) | set(delta.regions))
+    counts = np.zeros((len(years), len(regions), len(MEDALS)), dtype=np.int32)
+    for part in (cube, delta):
+        year_idx = np.searchsorted(years, part.years)
+        region_idx = np.searchsorted(regions, part.regions)
+        counts[np.ix_(year_idx, region_idx)] += part.counts
+    return MedalCube(years=years, regions=regions, counts=counts)
+
+
+@dataclass(frozen=True)
+class GenderCube:
+    """Distinct athletes per Year x Sport x Region x Sex, plus per edition over all sports"""
+    years: list
+    sports: list
+    regions: list  # the extra last region slot holds athletes without a region
+    counts: np.ndarray  # shape (len(years), len(sports), len(regions) + 1, 2)
+    region_athletes: np.ndarray  # shape (len(years), len(regions) + 1, 2), each athlete once per edition and region
+    athletes: np.ndarray  # shape (len(years), 2), each athlete once per edition
+
+
+def build_gender_cube(athletes, index):
+    """
+    Build the gender participation cube
+
+    Each cell counts distinct athletes, so an athlete entered in two
+    sports at one edition counts once in each sport. Summing cells
+    would count that athlete twice, so the per-region and per-edition
+    totals are kept separately, each athlete counted once with the sex
+    of their first row (as df.drop_duplicates(['Year', 'ID']) would).
+
+    Parameters:
+        athletes (pandas.DataFrame): Output of preprocessor.preprocess()
+        index (AthleteIndex): Athlete index built over athletes
+
+    Returns:
+        GenderCube: Athlete counts per edition, sport, region and sex
+    """
+    years = np.sort(athletes['Year'].unique())
+    year_idx = np.searchsorted(years, athletes['Year'].to_numpy())
+    sports, sport_idx = _axis(athletes['Sport'])
+    regions, region_idx = _axis(athletes['region'])
+    region_idx = np.where(region_idx < 0, len(regions), region_idx)
+    sexes, sex_codes = _axis(athletes['Sex'])
+    sex_idx = np.array([SEXES.index(s) if s in SEXES else -1 for s in sexes] + [-1])[sex_codes]
+
+    # One cell per (year, sport, region, sex); keep each athlete once per cell, then count
+    shape = (len(years), len(sports), len(regions) + 1, len(SEXES))
+    valid = sex_idx >= 0
+    cell = np.ravel_multi_index((year_idx[valid], sport_idx[valid], region_idx[valid], sex_idx[valid]), shape)
+    codes = athlete_index.athlete_codes(index)
+    pairs = pd.unique(cell * len(index.ids) + codes[valid])
+    counts = np.bincount(pairs // len(index.ids), minlength=int(np.prod(shape))).reshape(shape).astype(np.int32)
+
+    # First row of every (edition, region, athlete) and (edition, athlete) decides the sex counted
+    edition_region = year_idx * (len(regions) + 1) + region_idx
+    region_athletes = _count_first(edition_region, codes, len(index.ids), sex_idx,
+                                   (len(years), len(regions) + 1, len(SEXES)))
+    athletes = _count_first(year_idx, codes, len(index.ids), sex_idx, (len(years), len(SEXES)))
+
+    return GenderCube(years=[int(y) for y in years], sports=sports, regions=regions, counts=counts,
+                      region_athletes=region_athletes, athletes=athletes)
+
+
+def _count_first(group_idx, athlete_codes, n_ids, sex_idx, shape):
+    # np.unique reports the first row of every (group, athlete) pair
+    _, first = np.unique(group_idx.astype(np.int64) * n_ids + athlete_codes, return_index=True)
+    first = first[sex_idx[first] >= 0]
+    flat = group_idx[first].astype(np.int64) * len(SEXES) + sex_idx[first]
+    return np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape).astype(np.int32)
+
+
+def _axis(values):
+    """Sorted distinct non-null values as str, and each row's position among them (-1 if missing)"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Map the categories once and look rows up by code, instead of converting every row
+        codes = values.cat.codes.to_numpy()
+        categories = values.cat.categories.astype(str)
+        used = np.flatnonzero(np.bincount(codes[codes >= 0], minlength=len(categories)))
+        labels = np.sort(np.asarray(categories[used], dtype=object))
+        positions = np.full(len(categories) + 1, -1, dtype=np.int64)
+        positions[used] = np.searchsorted(labels, np.asarray(categories[used], dtype=object))
+        return labels.tolist(), positions[codes]
+    codes, uniques = pd.factorize(values, sort=True)
+    return [str(u) for u in uniques], codes.astype(np.int64)
+
+
+def merge_gender_cubes(cube, delta):
+    """
+    Add the cube of a new edition to history
+
+    Cells count distinct athletes, so they only add up when the two cubes
+    cover different editions, as incremental appends do.
+
+    Parameters:
+        cube (GenderCube): Existing cube
+        delta (GenderCube): Cube of editions not in cube
+
+    Returns:
+        GenderCube: Same as build_gender_cube() over both frames
+    """
+    years = sorted(set(cube.years) | set(delta.years))
+    sports = sorted(set(cube.sports) | set(delta.sports))
+    regions = sorted(set(cube.regions) | set(delta.regions))
+    counts = np.zeros((len(years), len(sports), len(regions) + 1, len(SEXES)), dtype=np.int32)
+    region_athletes = np.zeros((len(years), len(regions) + 1, len(SEXES)), dtype=np.int32)
+    athletes = np.zeros((len(years), len(SEXES)), dtype=np.int32)
+    for part in (cube, delta):
+        year_idx = np.searchsorted(years, part.years)
+        sport_idx = np.searchsorted(sports, part.sports)
+        region_idx = np.append(np.searchsorted(regions, part.regions), len(regions)).astype(np.int64)
+        counts[np.ix_(year_idx, sport_idx, region_idx)] += part.counts
+        region_athletes[np.ix_(year_idx, region_idx)] += part.region_athletes
+        athletes[year_idx] += part.athletes
+    return GenderCube(years=years, sports=sports, regions=regions, counts=counts,
+                      region_athletes=region_athletes, athletes=athletes)
+
+
+def query_gender_trend(cube, sport='Overall', country='Overall'):
+    """
+    Athletes per edition by sex, for all athletes, a sport or a country
+
+    Parameters:
+        cube (GenderCube): Cube from build_gender_cube()
+        sport (str): Sport name or 'Overall'
+        country (str): Region name or 'Overall'
+
+    Returns:
+        pandas.DataFrame: Year, Male, Female, Total, Male %, Female % for
+        every edition with athletes in the selection; athletes in several
+        sports count once unless a sport is selected
+    """
+    if sport == 'Overall':
+        if country == 'Overall':
+            by_year = cube.athletes.astype(np.int64)
+        else:
+            region = [cube.regions.index(country)] if country in cube.regions else []
+            by_year = cube.region_athletes[:, region].sum(axis=1).astype(np.int64)
+    else:
+        counts = cube.counts[:, [cube.sports.index(sport)]] if sport in cube.sports else cube.counts[:, :0]
+        if country != 'Overall':
+            counts = counts[:, :, [cube.regions.index(country)]] if country in cube.regions else counts[:, :, :0]
+        by_year = counts.sum(axis=(1, 2)).astype(np.int64)
+
+    # Built from arrays in one go; assigning columns one by one costs more than the lookup
+    total = by_year.sum(axis=1)
+    keep = total > 0
+    male, female, total = by_year[keep, 0], by_year[keep, 1], total[keep]
+    return pd.DataFrame({
+        'Year': np.asarray(cube.years, dtype=np.int64)[keep],
+        'Male': male,
+        'Female': female,
+        'Total': total,
+        'Male %': np.round(male / total * 100, 2),
+        'Female %': np.round(female / total * 100, 2)
+    })
+
+
+def build_sport_stats(athletes, medals):
+    """
+    Statistics for every sport, for the Sport Analysis page
+
+    Parameters:
+        athletes (pandas.DataFrame): Output of preprocessor.preprocess()
+        medals (pandas.DataFrame): Medal fact table from preprocessor.medal_events()
+
+    Returns:
+        pandas.DataFrame: One row per sport (sorted index of sport names)
+        with first_year, last_year, editions, events, athletes, nations,
+        male and female (distinct athletes) and medals (awarded, team
+        events counted once)
+    """
+    stats = athletes.groupby('Sport', observed=True).agg(
+        first_year=('Year', 'min'),
+        last_year=('Year', 'max'),
+        editions=('Year', 'nunique'),
+        events=('Event', 'nunique'),
+        athletes=('ID', 'nunique'),
+        nations=('region', 'nunique')
+    )
+    by_sex = athletes.groupby(['Sport', 'Sex'], observed=True)['ID'].nunique().unstack(fill_value=0)
+    stats['male'] = by_sex.get('M', 0)
+    stats['female'] = by_sex.get('F', 0)
+    stats['medals'] = medals.groupby('Sport', observed=True).size()
+
+    stats = stats.fillna(0).astype(np.int64)
+    stats.index = stats.index.astype(str)
+    return stats.sort_index()
+
+
+def query_sport_stats(stats, sport):
+    """
+    One sport's row, same keys as helper.get_sport_stats plus the extra columns
+
+    Parameters:
+        stats (pandas.DataFrame): Table from build_sport_stats()
+        sport (str): Sport name
+
+    Returns:
+        dict: first_year, last_year, editions, events, athletes, nations,
+        medals and gender_ratio ({'M': athletes, 'F': athletes})
+    """
+    row = stats.loc[sport]
+    result = {col: int(row[col]) for col in stats.columns if col not in ('male', 'female')}
+    result['gender_ratio'] = {'M': int(row['male']), 'F': int(row['female'])}
+    return result
+
+
+@dataclass(frozen=True)
+class CountryProfile:
+    """Everything the Country Analysis page shows for one region"""
+    gold: int
+    silver: int
+    bronze: int
+    total: int
+    athletes: int  # distinct athlete IDs
+    editions: int  # editions with at least one athlete
+    medal_timeline: pd.DataFrame  # Year, Medals for editions with medals
+    sport_heatmap: pd.DataFrame  # medals per Sport (rows) x Year (columns)
+    top_athletes: pd.DataFrame  # Name, Medals, Sport of the 10 most decorated athletes
+
+
+def build_country_profiles(athletes, medals, index, top=10):
+    """
+    Country Analysis bundles for every region at once
+
+    Rows are mapped to (region, ...) codes once and counted with one
+    bincount per measure, instead of filtering the frames for each
+    region as the per-country helpers do.
+
+    Parameters:
+        athletes (pandas.DataFrame): Output of preprocessor.preprocess()
+        medals (pandas.DataFrame): Medal fact table from preprocessor.medal_events()
+        index (AthleteIndex): Athlete index built over athletes
+        top (int): Athletes kept per region in top_athletes
+
+    Returns:
+        dict: region -> CountryProfile, in region order. medal_timeline,
+        sport_heatmap and top_athletes hold the data of
+        helper.yearwise_medal_tally, helper.country_event_heatmap and
+        helper.most_successful_countrywise (ties on Medals in ID order).
+    """
+    regions, region_idx = _axis(athletes['region'])
+    n_regions = len(regions)
+
+    # Distinct athletes and editions per region
+    known = region_idx >= 0
+    n_ids = max(len(index.ids), 1)
+    pairs = pd.unique(region_idx[known] * n_ids + athlete_index.athlete_codes(index)[known])
+    athlete_counts = np.bincount(pairs // n_ids, minlength=n_regions)
+    years = np.sort(athletes['Year'].unique())
+    played = np.zeros((n_regions, len(years)), dtype=bool)
+    played[region_idx[known], np.searchsorted(years, athletes['Year'].to_numpy()[known])] = True
+    edition_counts = played.sum(axis=1)
+
+    # Medal rows on the same region axis; every medal region also has athletes
+    medal_regions, medal_region_idx = _axis(medals['region'])
+    medal_region_idx = np.append(np.searchsorted(regions, medal_regions), -1)[medal_region_idx]
+    keep = medal_region_idx >= 0
+    medal_region_idx = medal_region_idx[keep]
+    medal_idx = np.select([medals[m].to_numpy(dtype=bool)[keep] for m in MEDALS], [0, 1, 2], default=-1)
+    by_type = np.zeros((n_regions, len(MEDALS)), dtype=np.int64)
+    np.add.at(by_type, (medal_region_idx[medal_idx >= 0], medal_idx[medal_idx >= 0]), 1)
+
+    # Medals per region, sport and edition; timelines and heatmaps are slices of this
+    sports, sport_idx = _axis(medals['Sport'])
+    sport_idx = sport_idx[keep]
+    medal_years = np.sort(medals['Year'].unique())
+    year_idx = np.searchsorted(medal_years, medals['Year'].to_numpy()[keep])
+    shape = (n_regions, len(sports) + 1, len(medal_years))  # last sport slot: no sport
+    flat = np.ravel_multi_index((medal_region_idx, np.where(sport_idx < 0, len(sports), sport_idx), year_idx), shape)
+    grid = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+
+    tops = _top_athletes(medals[keep], medal_region_idx, n_regions, top)
+
+    sports = np.asarray(sports, dtype=object)
+    year_dtype = medals['Year'].dtype
+    profiles = {}
+    for r, region in enumerate(regions):
+        per_year = grid[r].sum(axis=0)
+        with_medals = per_year > 0
+        heat = grid[r, :-1]
+        rows, cols = heat.any(axis=1), heat.any(axis=0)
+        gold, silver, bronze = (int(n) for n in by_type[r])
+        profiles[region] = CountryProfile(
+            gold=gold,
+            silver=silver,
+            bronze=bronze,
+            total=gold + silver + bronze,
+            athletes=int(athlete_counts[r]),
+            editions=int(edition_counts[r]),
+            medal_timeline=pd.DataFrame({
+                'Year': medal_years[with_medals].astype(year_dtype),
+                'Medals': per_year[with_medals]
+            }),
+            sport_heatmap=pd.DataFrame(
+                heat[np.ix_(rows, cols)],
+                index=pd.Index(sports[rows], name='Sport'),
+                columns=pd.Index(medal_years[cols].astype(year_dtype), name='Year')
+            ),
+            top_athletes=tops.get(r, tops[None])
+        )
+    return profiles
+
+
+def _top_athletes(medals, region_idx, n_regions, top):
+    # Medals per (region, athlete), grouped by region in ID order
+    ids, id_idx = np.unique(medals['ID'].to_numpy(), return_inverse=True)
+    key = region_idx * len(ids) + id_idx
+    keys, first, counts = np.unique(key, return_index=True, return_counts=True)
+
+    # Most medals first within each region; the stable sort keeps ties in ID order
+    order = np.lexsort((-counts, keys // len(ids)))
+    key_region = keys[order] // len(ids)
+    starts = np.searchsorted(key_region, np.arange(n_regions))
+    rank = np.arange(len(order)) - starts[key_region]
+    chosen = order[rank < top]
+
+    # Names and sports only for the chosen athletes
+    picked = np.isin(key, keys[chosen])
+    sports = pd.Series(medals['Sport'].astype(str).to_numpy()[picked]).groupby(key[picked]).agg(
+        lambda s: ', '.join(sorted(set(s)))
+    )
+    names = medals['Name'].iloc[first[chosen]]
+
+    table = pd.DataFrame({
+        'Name': names.to_numpy(),
+        'Medals': counts[chosen].astype(np.int64),
+        'Sport': sports.loc[keys[chosen]].to_numpy()
+    })
+    table['Name'] = table['Name'].astype(medals['Name'].dtype)
+    chosen_region = keys[chosen] // len(ids)
+    bounds = np.searchsorted(chosen_region, np.arange(n_regions + 1))
+    tops = {None: table.iloc[:0].reset_index(drop=True)}
+    for r in np.unique(chosen_region):
+        tops[int(r)] = table.iloc[bounds[r]:bounds[r + 1]].reset_index(drop=True)
+    return tops
+
+
+def query_medal_tally(cube, year, country):
+    """
+    Medal tally for a year and/or country, same result as helper.fetch_medal_tally
+
+    Parameters:
+        cube (MedalCube): Cube from build_medal_cube()
+        year: Edition year or 'Overall'
+        country (str): Region name or 'Overall'
+
+    Returns:
+        pandas.DataFrame: region, Gold, Silver, Bronze, Total sorted by rank
+    """
+    if year == 'Overall':
+        counts = cube.counts.sum(axis=0)
+    elif int(year) in cube.years:
+        counts = cube.counts[cube.years.index(int(year))]
+    else:
+        counts = np.zeros((len(cube.regions), len(MEDALS)), dtype=np.int32)
+
+    regions = np.asarray(cube.regions, dtype=object)
+    if country != 'Overall':
+        keep = regions == country
+        regions, counts = regions[keep], counts[keep]
+
+    totals = counts.sum(axis=1)
+    has_medals = totals > 0
+    regions, counts, totals = regions[has_medals], counts[has_medals], totals[has_medals]
+
+    # Rank by Total, Gold, Silver, Bronze; regions are sorted so ties stay alphabetical
+    order = np.lexsort((-counts[:, 2], -counts[:, 1], -counts[:, 0], -totals))
+
+    return pd.DataFrame({
+        'region': regions[order],
+        'Gold': counts[order, 0].astype(np.int64),
+        'Silver': counts[order, 1].astype(np.int64),
+        'Bronze': counts[order, 2].astype(np.int64),
+        'Total': totals[order].astype(np.int64)
+    })
@@ -1,8 +1,19 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import os
+import threading
 import preprocessor
 import helper
+import aggregates
+import backends
+import dataset
+import incremental
+import memo
+import profiler
+import sqlstore
+import warmup
+import figures
 import plotly.express as px
 import plotly.graph_objects as go
 import seaborn as sns
@@ -247,67 +258,60 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Default Plotly layout settings with dark theme
-default_layout = dict(
-    plot_bgcolor="#1e1e1e",  # Dark background
-    paper_bgcolor="#1e1e1e",
-    height=700,
-    width=None,
-    margin=dict(t=80, l=80, r=40, b=80),
-    font=dict(
-        size=16,
-        color="#ffffff",  # White text
-        family="Arial, sans-serif"
-    ),
-    title=dict(
-        font=dict(size=24, color="#ffffff", family="Arial, sans-serif"),
-        y=0.95,
-        x=0.5,
-        xanchor='center',
-        yanchor='top'
-    ),
-    showlegend=True,
-    legend=dict(
-        bgcolor="rgba(30, 30, 30, 0.9)",
-        bordercolor="#404040",
-        borderwidth=1,
-        font=dict(size=14, family="Arial, sans-serif", color="#ffffff"),
-        yanchor="top",
-        y=0.99,
-        xanchor="left",
-        x=1.02
-    ),
-    xaxis=dict(
-        showgrid=True,
-        gridcolor='#404040',
-        gridwidth=1,
-        linecolor='#ffffff',
-        linewidth=2,
-        tickfont=dict(size=14, family="Arial, sans-serif", color="#ffffff"),
-        title_font=dict(size=18, family="Arial, sans-serif", color="#ffffff"),
-        tickangle=30
-    ),
-    yaxis=dict(
-        showgrid=True,
-        gridcolor='#404040',
-        gridwidth=1,
-        linecolor='#ffffff',
-        linewidth=2,
-        tickfont=dict(size=14, family="Arial, sans-serif", color="#ffffff"),
-        title_font=dict(size=18, family="Arial, sans-serif", color="#ffffff")
-    )
-)
+# Athlete events and NOC regions CSVs; OLYMPICS_ATHLETES points the app at another events file
+SOURCES = (os.environ.get('OLYMPICS_ATHLETES', 'athlete_events.csv'), 'noc_regions.csv')
+
+# The Dataset every session of the process shares, and the source file stamps it was loaded at
+@st.cache_resource
+def served_data():
+    return {'data': None, 'stamp': None, 'lock': threading.Lock()}
 
-# Load data
-@st.cache_data
 def load_data():
-    df = pd.read_csv('athlete_events.csv')
-    df_region = pd.read_csv('noc_regions.csv')
-    df = preprocessor.preprocess(df, df_region)
-    return df
+    """
+    The frozen Dataset for the current source files, loaded once per version
+
+    When the files change on disk (incremental.py appended an edition, say),
+    the served dataset is extended by the delta and its cached results are
+    carried forward instead of loading from scratch.
+    """
+    served = served_data()
+    stamp = [(os.stat(path).st_size, os.stat(path).st_mtime_ns) for path in SOURCES]
+    with served['lock']:
+        if served['data'] is None or served['stamp'] != stamp:
+            if served['data'] is None:
+                data = dataset.load_dataset(*SOURCES, compact_dtypes=True)
+            else:
+                data = incremental.refresh(served['data'], *SOURCES)
+            # The SQLite engine answers from a store file built from the same sources, beside the in-memory data
+            if backends.current() == 'sqlite' and data is not served['data']:
+                sqlstore.attach(data, sqlstore.load_store(*SOURCES))
+            served['data'] = data
+        served['stamp'] = stamp
+        return served['data']
+
+# Fill the shared result cache in the background once per dataset version; sessions don't wait for it
+@st.cache_resource
+def start_warmup(_data, version):
+    return warmup.start(_data)
+
+def plotly_chart(name, fig, **kwargs):
+    """st.plotly_chart, timed and with its payload size recorded when profiling"""
+    with profiler.span(f'chart:{name}') as span:
+        st.plotly_chart(fig, **kwargs)
+    if span is not None:
+        span['bytes'] = len(fig.to_json())
+
+# Opt-in per-rerun timing, toggled in the sidebar Debug panel
+profiler.start_run(st.session_state.get('debug_profile', profiler.ENABLED_BY_DEFAULT))
 
 try:
-    df = load_data()
+    with profiler.span('load_data'):
+        data = load_data()
+    df, medals, medal_cube = data.athletes, data.medals, data.medal_cube
+    gender_cube = data.gender_cube
+    age_summaries = data.age_summaries
+    summary = data.summary
+    warmup_status = start_warmup(data, data.version)
 except Exception as e:
     st.error(f"Error loading data: {str(e)}")
     st.stop()
@@ -321,6 +325,9 @@ with st.sidebar:
         ['🏅 Medal Tally', '📊 Overall Analysis', '🌍 Country Analysis', '🏃‍♂️ Athlete Analysis', '⚽ Sport Analysis']
     )
 
+# Selector values of this rerun, recorded as traffic for the warm-up's 'top' mode
+selection = {}
+
 # Medal Tally
 if user_menu == '🏅 Medal Tally':
     st.sidebar.header('Medal Tally')
@@ -328,8 +335,9 @@ if user_menu == '🏅 Medal Tally':
     
     selected_year = st.sidebar.selectbox('Select Year', years)
     selected_country = st.sidebar.selectbox('Select Country', countries)
+    selection.update(year=selected_year, country=selected_country)
 
-    medal_tally = helper.fetch_medal_tally(df, selected_year, selected_country)
+    medal_tally = aggregates.query_medal_tally(medal_cube, selected_year, selected_country)
 
     if selected_year == "Overall" and selected_country == 'Overall':
         st.markdown("### 🏅 Overall Medal Tally")
@@ -367,36 +375,15 @@ if user_menu == '🏅 Medal Tally':
         
         # Create medal visualization
         if selected_country == 'Overall':
-            fig = px.bar(medal_tally, 
-                        x='region' if 'region' in medal_tally.columns else 'NOC',
-                        y=['Gold', 'Silver', 'Bronze'],
-                        title='Medal Distribution by Country',
-                        labels={'value': 'Number of Medals', 'variable': 'Medal Type'},
-                        color_discrete_map={
-                            'Gold': 'gold',
-                            'Silver': 'silver',
-                            'Bronze': '#cd7f32'
-                        })
-            
-            fig.update_layout(
-                barmode='group',
-                xaxis_tickangle=-45,
-                height=500,
-                legend_title_text='Medal Type',
-                showlegend=True
-            )
+            with profiler.span('figure:medal_bar'):
+                fig = figures.medal_bar(medal_tally)
             
-            st.plotly_chart(fig, use_container_width=True)
+            plotly_chart('medal_bar', fig, use_container_width=True)
             
             # Add pie chart for total medal distribution
-            fig_pie = px.pie(medal_tally, 
-                           values='Total', 
-                           names='region' if 'region' in medal_tally.columns else 'NOC',
-                           title='Share of Total Olympic Medals',
-                           hole=0.3)
-            
-            fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-            st.plotly_chart(fig_pie, use_container_width=True)
+            with profiler.span('figure:medal_pie'):
+                fig_pie = figures.medal_pie(medal_tally)
+            plotly_chart('medal_pie', fig_pie, use_container_width=True)
     else:
         st.info("No medal data available for the selected criteria.")
 
@@ -404,12 +391,13 @@ if user_menu == '🏅 Medal Tally':
 elif user_menu == '📊 Overall Analysis':
     st.markdown("<h1 class='title-text'>Olympic Games Analysis</h1>", unsafe_allow_html=True)
     
-    editions = df['Year'].nunique()
-    cities = df['City'].nunique()
-    sports = df['Sport'].nunique()
-    events = df['Event'].nunique()
-    athletes = df['Name'].nunique()
-    nations = df['region'].nunique()
+    # Headline numbers are computed once per dataset version at load
+    editions = summary.editions
+    cities = summary.host_cities
+    sports = summary.sports
+    events = summary.events
+    athletes = summary.athletes
+    nations = summary.nations
 
     col1, col2, col3 = st.columns(3)
     
@@ -465,16 +453,14 @@ elif user_menu == '📊 Overall Analysis':
 
     st.markdown("### 📈 Participation Trends")
     
+    # Distinct counts per edition, one precomputed frame shared by the three tabs
+    participation = summary.participation
     tab1, tab2, tab3 = st.tabs(["Countries", "Events", "Athletes"])
     
     with tab1:
-        nations_over_time = helper.data_over_time(df, 'region')
-        fig = px.line(nations_over_time, x='Year', y='Count',
-                     title='Participating Nations Over Time',
-                     labels={'Count': 'Number of Countries'})
-        fig.update_layout(plot_bgcolor='white')
-        fig.update_layout(default_layout)
-        st.plotly_chart(fig, use_container_width=True, config={
+        with profiler.span('figure:nations_over_time'):
+            fig = figures.participation_trend(participation, 'region')
+        plotly_chart('nations_over_time', fig, use_container_width=True, config={
                 'displayModeBar': True,
                 'scrollZoom': True,
                 'displaylogo': False,
@@ -482,13 +468,9 @@ elif user_menu == '📊 Overall Analysis':
             })
         
     with tab2:
-        events_over_time = helper.data_over_time(df, 'Event')
-        fig = px.line(events_over_time, x='Year', y='Count',
-                     title='Olympic Events Over Time',
-                     labels={'Count': 'Number of Events'})
-        fig.update_layout(plot_bgcolor='white')
-        fig.update_layout(default_layout)
-        st.plotly_chart(fig, use_container_width=True, config={
+        with profiler.span('figure:events_over_time'):
+            fig = figures.participation_trend(participation, 'Event')
+        plotly_chart('events_over_time', fig, use_container_width=True, config={
                 'displayModeBar': True,
                 'scrollZoom': True,
                 'displaylogo': False,
@@ -496,13 +478,9 @@ elif user_menu == '📊 Overall Analysis':
             })
         
     with tab3:
-        athletes_over_time = helper.data_over_time(df, 'Name')
-        fig = px.line(athletes_over_time, x='Year', y='Count',
-                     title='Athletes Participation Over Time',
-                     labels={'Count': 'Number of Athletes'})
-        fig.update_layout(plot_bgcolor='white')
-        fig.update_layout(default_layout)
-        st.plotly_chart(fig, use_container_width=True, config={
+        with profiler.span('figure:athletes_over_time'):
+            fig = figures.participation_trend(participation, 'ID')
+        plotly_chart('athletes_over_time', fig, use_container_width=True, config={
                 'displayModeBar': True,
                 'scrollZoom': True,
                 'displaylogo': False,
@@ -511,70 +489,12 @@ elif user_menu == '📊 Overall Analysis':
 
     st.markdown("### 🏆 Sports Analysis")
     
-    # Create pivot table for heatmap
-    pivot_data = df.pivot_table(
-        index='Sport', 
-        columns='Year', 
-        values='Event', 
-        aggfunc='count',
-        fill_value=0
-    )
-    
-    # Create heatmap with annotations
-    fig = px.imshow(
-        pivot_data,
-        color_continuous_scale='Viridis',  # Using Viridis colorscale for better visibility in dark theme
-        aspect='auto'  # Maintain aspect ratio
-    )
-    
-    # Update layout for better visibility
-    fig.update_layout(
-        title=dict(
-            text='Number of Events per Sport Over Time',
-            font=dict(size=24)
-        ),
-        height=max(600, len(pivot_data.index) * 25),  # Dynamic height based on number of sports
-        xaxis=dict(
-            title='Year',
-            tickangle=45,
-            tickfont=dict(size=12),
-            tickmode='array',
-            ticktext=[str(int(year)) for year in pivot_data.columns],
-            tickvals=list(range(len(pivot_data.columns)))
-        ),
-        yaxis=dict(
-            title='Sport',
-            tickfont=dict(size=12)
-        ),
-        coloraxis=dict(
-            colorbar=dict(
-                title='Number of Events',
-                tickfont=dict(size=12),
-                titlefont=dict(size=14)
-            )
-        )
-    )
-    
-    # Add text annotations to show numbers in each cell
-    for i in range(len(pivot_data.index)):
-        for j in range(len(pivot_data.columns)):
-            value = pivot_data.iloc[i, j]
-            if value > 0:  # Only show non-zero values
-                fig.add_annotation(
-                    x=j,
-                    y=i,
-                    text=str(int(value)),
-                    showarrow=False,
-                    font=dict(
-                        color='white',
-                        size=10
-                    )
-                )
-    
-    fig.update_layout(default_layout)
+    # Events per sport and year, precomputed at load
+    with profiler.span('figure:events_heatmap'):
+        fig = figures.events_heatmap(summary.events_heatmap)
     
     # Show the heatmap
-    st.plotly_chart(fig, use_container_width=True, config={
+    plotly_chart('events_heatmap', fig, use_container_width=True, config={
         'displayModeBar': True,
         'scrollZoom': True,
         'displaylogo': False,
@@ -586,12 +506,13 @@ elif user_menu == '🌍 Country Analysis':
     st.markdown("<h1 class='title-text'>Country Analysis</h1>", unsafe_allow_html=True)
     
     # Country selection - ensure all values are strings before sorting
-    countries = ['Overall'] + sorted([str(x) for x in df['region'].astype(str).unique() if pd.notna(x)])
+    countries = ['Overall'] + list(data.country_profiles)
     selected_country = st.selectbox('Select Country', countries)
+    selection['country'] = selected_country
 
     if selected_country == 'Overall':
         # Show overall statistics
-        medal_tally = helper.medal_tally(df)
+        medal_tally = helper.medal_tally(medals)
         
         # Display the medal tally table
         st.dataframe(medal_tally.style.format({
@@ -601,16 +522,14 @@ elif user_menu == '🌍 Country Analysis':
             'Total': '{:,.0f}'
         }), use_container_width=True)
     else:
-        # Country statistics
-        country_df = df[df['region'] == selected_country].copy()
-        
-        # Count medals by type, handling team events by deduplicating on unique event identifiers
-        medal_df = country_df.drop_duplicates(subset=['Year', 'Sport', 'Event', 'Medal'])
+        # Precomputed bundle: every number and table below is a lookup
+        profile = data.country_profiles[selected_country]
         
-        gold_medals = len(medal_df[medal_df['Medal'] == 'Gold'])
-        silver_medals = len(medal_df[medal_df['Medal'] == 'Silver'])
-        bronze_medals = len(medal_df[medal_df['Medal'] == 'Bronze'])
-        total_medals = gold_medals + silver_medals + bronze_medals
+        # Team events are already collapsed in the medal table
+        gold_medals = profile.gold
+        silver_medals = profile.silver
+        bronze_medals = profile.bronze
+        total_medals = profile.total
         
         col1, col2, col3, col4 = st.columns(4)
         
@@ -649,7 +568,7 @@ elif user_menu == '🌍 Country Analysis':
         col1, col2 = st.columns(2)
         
         with col1:
-            total_athletes = country_df['Name'].nunique()
+            total_athletes = profile.athletes
             st.markdown(f"""
                 <div class='metric-card'>
                     <h3>Total Athletes</h3>
@@ -658,7 +577,7 @@ elif user_menu == '🌍 Country Analysis':
             """, unsafe_allow_html=True)
             
         with col2:
-            years_participated = country_df['Year'].nunique()
+            years_participated = profile.editions
             st.markdown(f"""
                 <div class='metric-card'>
                     <h3>Olympics Participated</h3>
@@ -668,30 +587,13 @@ elif user_menu == '🌍 Country Analysis':
 
         # Medal timeline
         st.markdown("### 📈 Medal Timeline")
-        medal_timeline = helper.yearwise_medal_tally(df, selected_country)
+        medal_timeline = profile.medal_timeline
         
         if not medal_timeline.empty:
-            fig = px.line(medal_timeline, x='Year', y='Medals',
-                         title=f'Medal Timeline for {selected_country}',
-                         labels={'Medals': 'Number of Medals'})
-            
-            # Update layout for better visibility
-            fig.update_traces(
-                line=dict(width=3),
-                mode='lines+markers',
-                marker=dict(size=8)
-            )
-            
-            fig.update_layout(
-                xaxis_title="Year",
-                yaxis_title="Number of Medals",
-                showlegend=False,
-                hovermode='x unified'
-            )
-            
-            fig.update_layout(default_layout)
+            with profiler.span('figure:medal_timeline'):
+                fig = figures.medal_timeline(medal_timeline, selected_country)
             
-            st.plotly_chart(fig, use_container_width=True, config={
+            plotly_chart('medal_timeline', fig, use_container_width=True, config={
                 'displayModeBar': True,
                 'scrollZoom': True,
                 'displaylogo': False,
@@ -702,20 +604,12 @@ elif user_menu == '🌍 Country Analysis':
 
         # Sports Performance
         st.markdown("### 🏆 Sports Performance")
-        sports_data = helper.country_event_heatmap(df, selected_country)
+        sports_data = profile.sport_heatmap
         
         if not sports_data.empty:
-            fig = px.imshow(
-                sports_data,
-                labels=dict(x="Year", y="Sport", color="Medals"),
-                aspect="auto"
-            )
-            fig.update_layout(
-                title=f'{selected_country}\'s Performance in Different Sports',
-                plot_bgcolor='white'
-            )
-            fig.update_layout(default_layout)
-            st.plotly_chart(fig, use_container_width=True, config={
+            with profiler.span('figure:sports_heatmap'):
+                fig = figures.sports_heatmap(sports_data, selected_country)
+            plotly_chart('sports_heatmap', fig, use_container_width=True, config={
                     'displayModeBar': True,
                     'scrollZoom': True,
                     'displaylogo': False,
@@ -726,24 +620,12 @@ elif user_menu == '🌍 Country Analysis':
 
         # Top Athletes
         st.markdown("### 🥇 Top Athletes")
-        top_athletes = helper.most_successful_countrywise(df, selected_country)
+        top_athletes = profile.top_athletes
         
         if not top_athletes.empty:
-            fig = px.bar(
-                top_athletes.head(10),
-                x='Name',
-                y='Medals',
-                text='Medals',
-                hover_data=['Sport'],
-                title=f'Top 10 Athletes from {selected_country}'
-            )
-            fig.update_layout(
-                plot_bgcolor='white',
-                xaxis_title="Athlete",
-                yaxis_title="Number of Medals"
-            )
-            fig.update_layout(default_layout)
-            st.plotly_chart(fig, use_container_width=True, config={
+            with profiler.span('figure:top_athletes'):
+                fig = figures.top_athletes(top_athletes, selected_country)
+            plotly_chart('top_athletes', fig, use_container_width=True, config={
                     'displayModeBar': True,
                     'scrollZoom': True,
                     'displaylogo': False,
@@ -752,6 +634,20 @@ elif user_menu == '🌍 Country Analysis':
         else:
             st.info(f"No athlete data available for {selected_country}")
 
+        # Gender participation
+        st.markdown("### 👥 Athletes by Gender")
+        country_gender = aggregates.query_gender_trend(gender_cube, country=selected_country)
+        
+        if not country_gender.empty:
+            with profiler.span('figure:country_gender'):
+                fig = figures.gender_trend(country_gender, f'Athletes from {selected_country} by Gender')
+            plotly_chart('country_gender', fig, use_container_width=True, config={
+                    'displayModeBar': True,
+                    'scrollZoom': True,
+                    'displaylogo': False,
+                    'modeBarButtonsToAdd': ['zoom', 'pan', 'select', 'zoomIn', 'zoomOut', 'autoScale', 'resetScale']
+                })
+
 # Athlete Analysis
 elif user_menu == '🏃‍♂️ Athlete Analysis':
     st.markdown("<h1 class='title-text'>Athlete Analysis</h1>", unsafe_allow_html=True)
@@ -764,16 +660,9 @@ elif user_menu == '🏃‍♂️ Athlete Analysis':
         col1, col2 = st.columns(2)
         with col1:
             # Overall age distribution
-            x1 = df['Age'].dropna()
-            fig = px.histogram(
-                x=x1,
-                nbins=30,
-                title='Overall Age Distribution',
-                labels={'x': 'Age', 'y': 'Count'}
-            )
-            fig.update_layout(plot_bgcolor='white')
-            fig.update_layout(default_layout)
-            st.plotly_chart(fig, use_container_width=True, config={
+            with profiler.span('figure:age_histogram'):
+                fig = figures.age_histogram(age_summaries)
+            plotly_chart('age_histogram', fig, use_container_width=True, config={
                 'displayModeBar': True,
                 'scrollZoom': True,
                 'displaylogo': False,
@@ -782,28 +671,9 @@ elif user_menu == '🏃‍♂️ Athlete Analysis':
             
         with col2:
             # Medal winners age distribution
-            medal_ages = {
-                'Gold': df[df['Medal'] == 'Gold']['Age'].dropna(),
-                'Silver': df[df['Medal'] == 'Silver']['Age'].dropna(),
-                'Bronze': df[df['Medal'] == 'Bronze']['Age'].dropna()
-            }
-            
-            fig = go.Figure()
-            for medal, ages in medal_ages.items():
-                fig.add_trace(go.Violin(
-                    y=ages,
-                    name=medal,
-                    box_visible=True,
-                    meanline_visible=True
-                ))
-            
-            fig.update_layout(
-                title='Age Distribution by Medal Type',
-                yaxis_title='Age',
-                plot_bgcolor='white'
-            )
-            fig.update_layout(default_layout)
-            st.plotly_chart(fig, use_container_width=True, config={
+            with profiler.span('figure:age_by_medal'):
+                fig = figures.age_by_medal(age_summaries)
+            plotly_chart('age_by_medal', fig, use_container_width=True, config={
                 'displayModeBar': True,
                 'scrollZoom': True,
                 'displaylogo': False,
@@ -812,26 +682,13 @@ elif user_menu == '🏃‍♂️ Athlete Analysis':
         
         # Age distribution by sport
         st.markdown("### Age Distribution by Sport")
-        sports = ['Overall'] + sorted(df['Sport'].unique().tolist())
+        sports = ['Overall'] + summary.sport_names
         selected_sport = st.selectbox('Select Sport', sports)
         
-        if selected_sport == 'Overall':
-            sport_df = df
-        else:
-            sport_df = df[df['Sport'] == selected_sport]
-        
-        fig = px.violin(
-            sport_df,
-            y='Age',
-            x='Sex',
-            color='Medal',
-            box=True,
-            title=f'Age Distribution for {selected_sport}',
-            labels={'Age': 'Age (years)', 'Sex': 'Gender'}
-        )
-        fig.update_layout(plot_bgcolor='white')
-        fig.update_layout(default_layout)
-        st.plotly_chart(fig, use_container_width=True, config={
+        # Precomputed per (sport, sex, medal) - switching sports does not touch df
+        with profiler.span('figure:age_by_sport'):
+            fig = figures.age_by_sport(age_summaries, selected_sport)
+        plotly_chart('age_by_sport', fig, use_container_width=True, config={
                 'displayModeBar': True,
                 'scrollZoom': True,
                 'displaylogo': False,
@@ -842,51 +699,30 @@ elif user_menu == '🏃‍♂️ Athlete Analysis':
         st.markdown("### Physical Attributes Analysis")
         
         # Sport selection for physical attributes
-        sports = ['Overall'] + sorted(df['Sport'].unique().tolist())
+        sports = ['Overall'] + summary.sport_names
         selected_sport = st.selectbox('Select Sport for Physical Analysis', sports)
+        selection['sport'] = selected_sport
         
-        if selected_sport == 'Overall':
-            sport_df = df
-        else:
-            sport_df = df[df['Sport'] == selected_sport]
-        
-        # Height vs Weight scatter plot
-        fig = px.scatter(
-            sport_df,
-            x='Weight',
-            y='Height',
-            color='Sex',
-            symbol='Medal',
-            title=f'Height vs Weight Distribution for {selected_sport}',
-            labels={
-                'Weight': 'Weight (kg)',
-                'Height': 'Height (cm)',
-                'Sex': 'Gender'
-            }
-        )
-        fig.update_layout(plot_bgcolor='white')
-        fig.update_layout(default_layout)
-        st.plotly_chart(fig, use_container_width=True, config={
+        # Unique athletes per Games with both measurements
+        physical_df = helper.weight_v_height(df, selected_sport)
+        
+        # Height vs Weight - raw points for small slices, WebGL for mid-sized, binned density beyond
+        with profiler.span('figure:height_weight'):
+            fig = figures.height_weight(df, physical_df, selected_sport)
+        plotly_chart('height_weight', fig, use_container_width=True, config={
                 'displayModeBar': True,
                 'scrollZoom': True,
                 'displaylogo': False,
                 'modeBarButtonsToAdd': ['zoom', 'pan', 'select', 'zoomIn', 'zoomOut', 'autoScale', 'resetScale']
             })
         
-        # Gender participation
+        # Gender participation: athletes at each edition, from the precomputed gender cube
         st.markdown("### 👥 Gender Distribution Over Time")
-        gender_data = helper.men_vs_women(df)
-        
-        fig = px.line(
-            gender_data,
-            x='Year',
-            y=['Male', 'Female'],
-            title='Gender Distribution in Olympics',
-            labels={'value': 'Number of Athletes', 'variable': 'Gender'}
-        )
-        fig.update_layout(plot_bgcolor='white')
-        fig.update_layout(default_layout)
-        st.plotly_chart(fig, use_container_width=True, config={
+        gender_data = aggregates.query_gender_trend(gender_cube)
+        
+        with profiler.span('figure:gender_over_time'):
+            fig = figures.gender_trend(gender_data, 'Gender Distribution in Olympics')
+        plotly_chart('gender_over_time', fig, use_container_width=True, config={
                 'displayModeBar': True,
                 'scrollZoom': True,
                 'displaylogo': False,
@@ -898,14 +734,15 @@ elif user_menu == '⚽ Sport Analysis':
     st.markdown("<h1 class='title-text'>Sport Analysis</h1>", unsafe_allow_html=True)
     
     # Sport selection
-    sports = ['Overall'] + sorted(df['Sport'].unique().tolist())
+    sports = ['Overall'] + summary.sport_names
     selected_sport = st.selectbox('Select Sport', sports)
+    selection['sport'] = selected_sport
     
     if selected_sport == 'Overall':
         # Show overall sports statistics
-        total_sports = len(df['Sport'].unique())
-        total_events = len(df['Event'].unique())
-        total_athletes = len(df['Name'].unique())
+        total_sports = summary.sports
+        total_events = summary.events
+        total_athletes = summary.athletes
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -933,16 +770,13 @@ elif user_menu == '⚽ Sport Analysis':
             """, unsafe_allow_html=True)
             
         # Show sports distribution
-        sports_dist = df.groupby('Sport')['Event'].nunique().sort_values(ascending=True)
-        fig = px.bar(sports_dist, 
-                    orientation='h',
-                    title='Number of Events by Sport',
-                    labels={'Sport': 'Sport', 'Event': 'Number of Events'})
-        fig.update_layout(default_layout)
-        st.plotly_chart(fig, use_container_width=True)
+        with profiler.span('figure:events_per_sport'):
+            fig = figures.events_per_sport(summary.events_per_sport)
+        plotly_chart('events_per_sport', fig, use_container_width=True)
     else:
         # Get sport statistics
-        sport_stats = helper.get_sport_stats(df, selected_sport)
+        # One row of the per-sport table built at load
+        sport_stats = aggregates.query_sport_stats(data.sport_stats, selected_sport)
         
         # Display metrics
         col1, col2, col3 = st.columns(3)
@@ -970,9 +804,35 @@ elif user_menu == '⚽ Sport Analysis':
                 </div>
             """, unsafe_allow_html=True)
 
-        # Gender distribution in sport
-        male_athletes = sport_stats['gender_ratio'].get('M', 0)
-        female_athletes = sport_stats['gender_ratio'].get('F', 0)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown(f"""
+                <div class='metric-card'>
+                    <h3>Editions Contested</h3>
+                    <h2 style='color:#1f77b4'>{sport_stats['editions']}</h2>
+                </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+                <div class='metric-card'>
+                    <h3>Nations</h3>
+                    <h2 style='color:#1f77b4'>{sport_stats['nations']}</h2>
+                </div>
+            """, unsafe_allow_html=True)
+        
+        with col3:
+            st.markdown(f"""
+                <div class='metric-card'>
+                    <h3>Medals Awarded</h3>
+                    <h2 style='color:#1f77b4'>{sport_stats['medals']:,}</h2>
+                </div>
+            """, unsafe_allow_html=True)
+
+        # Gender distribution in sport: distinct athletes, from the same row as the metrics above
+        gender_ratio = sport_stats['gender_ratio']
+        male_athletes = gender_ratio['M']
+        female_athletes = gender_ratio['F']
         total_athletes = male_athletes + female_athletes
         
         if total_athletes > 0:
@@ -980,12 +840,21 @@ elif user_menu == '⚽ Sport Analysis':
             female_percent = round((female_athletes / total_athletes * 100), 1)
             
             st.markdown("### ⚖️ Gender Distribution")
-            fig_gender = px.pie(values=[male_percent, female_percent],
-                              names=['Male', 'Female'],
-                              title=f'Gender Distribution in {selected_sport}')
-            fig_gender.update_traces(textinfo='percent+label')
-            fig_gender.update_layout(default_layout)
-            st.plotly_chart(fig_gender, use_container_width=True, config={
+            with profiler.span('figure:sport_gender'):
+                fig_gender = figures.sport_gender(male_percent, female_percent, selected_sport)
+            plotly_chart('sport_gender', fig_gender, use_container_width=True, config={
+                    'displayModeBar': True,
+                    'scrollZoom': True,
+                    'displaylogo': False,
+                    'modeBarButtonsToAdd': ['zoom', 'pan', 'select', 'zoomIn', 'zoomOut', 'autoScale', 'resetScale']
+                })
+
+            with profiler.span('figure:sport_gender_over_time'):
+                fig = figures.gender_trend(
+                    aggregates.query_gender_trend(gender_cube, sport=selected_sport),
+                    f'{selected_sport} Athletes by Gender Over Time'
+                )
+            plotly_chart('sport_gender_over_time', fig, use_container_width=True, config={
                     'displayModeBar': True,
                     'scrollZoom': True,
                     'displaylogo': False,
@@ -994,3 +863,41 @@ elif user_menu == '⚽ Sport Analysis':
 
 else:
     st.error("Invalid menu selection")
+
+# Always-on traffic log: one line whenever a session's selection changes, not on every rerun
+if selection != st.session_state.get('recorded_selection'):
+    warmup.record(selection)
+    st.session_state['recorded_selection'] = selection
+
+# Shared result cache counters (all sessions in this process)
+with st.sidebar.expander("Cache Statistics"):
+    cache_stats = memo.stats()
+    st.caption(
+        f"Hits: {cache_stats['hits']:,} · Misses: {cache_stats['misses']:,} · "
+        f"Evictions: {cache_stats['evictions']:,}  \n"
+        f"Entries: {cache_stats['entries']:,}/{cache_stats['max_entries']:,} · "
+        f"Size: {cache_stats['bytes'] / 1e6:.1f}/{cache_stats['max_bytes'] / 1e6:.0f} MB  \n"
+        f"Compute time: {cache_stats['compute_seconds']:.2f}s"
+    )
+    if warmup_status.finished:
+        failed = f" · {warmup_status.failed:,} failed" if warmup_status.failed else ""
+        st.caption(f"Warm-up ({warmup_status.mode}): {warmup_status.total:,} tasks in "
+                   f"{warmup_status.seconds:.1f}s{failed}")
+    else:
+        st.caption(f"Warm-up ({warmup_status.mode}): running")
+        st.progress(warmup_status.done / warmup_status.total,
+                    text=f"{warmup_status.done:,}/{warmup_status.total:,} tasks")
+
+# Per-stage timings of this rerun; the checkbox takes effect from the next rerun
+with st.sidebar.expander("Debug"):
+    st.checkbox("Profile reruns", value=profiler.ENABLED_BY_DEFAULT, key='debug_profile')
+    st.checkbox(f"Append to {profiler.DEFAULT_LOG_PATH}", key='debug_profile_export')
+    report = profiler.finish_run(page=user_menu, selection=selection)
+    if report is not None:
+        spans = pd.DataFrame(report['spans'], columns=['name', 'depth', 'offset_ms', 'ms', 'bytes'])
+        spans['name'] = ['\u00a0' * 4 * depth + name for name, depth in zip(spans['name'], spans['depth'])]
+        untracked = report['total_ms'] - spans.loc[spans['depth'] == 0, 'ms'].sum()
+        st.caption(f"Rerun: {report['total_ms']:,.1f} ms · outside spans: {untracked:,.1f} ms")
+        st.dataframe(spans[['name', 'ms', 'bytes']], hide_index=True, use_container_width=True)
+        if st.session_state.get('debug_profile_export'):
+            profiler.export(report)
@@ -0,0 +1,201 @@
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+_lock = threading.Lock()
+_tables = {}  # id(frame) -> (weakref to frame, Arrow table, {keys: first row positions})
+
+
+def _entry(df):
+    key = id(df)
+    with _lock:
+        entry = _tables.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry
+
+    t = pa.Table.from_pandas(df, preserve_index=False)
+    t = t.append_column('_row', pa.array(np.arange(len(df), dtype=np.int64)))
+    entry = (weakref.ref(df, lambda _: _tables.pop(key, None)), t, {})
+    with _lock:
+        _tables[key] = entry
+    return entry
+
+
+def table(df):
+    """
+    Arrow view of a shared DataFrame, converted once per frame
+
+    Categoricals become dictionary arrays and numeric columns are mostly
+    zero-copy, so the table costs little beyond the frame itself. A _row
+    column holds each row's position for keep-first deduplication.
+    """
+    return _entry(df)[1]
+
+
+def first_rows(df, keys):
+    """
+    Positions of the first row of every distinct keys combination, in frame order
+
+    Shared across calls on the same frame, as several helpers deduplicate
+    athletes the same way before filtering.
+    """
+    _, t, cache = _entry(df)
+    keys = tuple(keys)
+    if keys not in cache:
+        rows = t.group_by(list(keys)).aggregate([('_row', 'min')])['_row_min']
+        cache[keys] = np.sort(rows.to_numpy())
+    return cache[keys]
+
+
+def where(t, **equals):
+    """Rows of t whose columns equal the given values"""
+    mask = None
+    for col, value in equals.items():
+        cond = pc.equal(t[col], value)
+        mask = cond if mask is None else pc.and_(mask, cond)
+    return t if mask is None else t.filter(mask)
+
+
+def distinct(col):
+    """Number of distinct non-null values, as Series.nunique()"""
+    return len(pc.unique(pc.drop_null(col)))
+
+
+def country_year_list(df):
+    t = table(df)
+    years = sorted(pc.unique(t['Year']).to_pylist())
+    countries = sorted(pc.unique(pc.drop_null(t['region'])).to_pylist())
+    return ['Overall'] + years, ['Overall'] + countries
+
+
+def fetch_medal_tally(medals, year, country):
+    filters = {}
+    if year != 'Overall':
+        filters['Year'] = int(year)
+    if country != 'Overall':
+        filters['region'] = country
+    t = where(table(medals), **filters)
+
+    tally = t.group_by('region').aggregate([(m, 'sum') for m in ['Gold', 'Silver', 'Bronze']])
+    counts = {m: pc.cast(tally[f'{m}_sum'], pa.int64()) for m in ['Gold', 'Silver', 'Bronze']}
+    tally = pa.table({
+        'region': pc.cast(tally['region'], pa.string()),
+        **counts,
+        'Total': pc.add(pc.add(counts['Gold'], counts['Silver']), counts['Bronze'])
+    }).sort_by([('Total', 'descending'), ('Gold', 'descending'), ('Silver', 'descending'),
+                ('Bronze', 'descending'), ('region', 'ascending')])
+
+    result = tally.to_pandas()
+    result['region'] = result['region'].astype(medals['region'].dtype)
+    return result
+
+
+def data_over_time(df, col):
+    if col == 'Countries':
+        col = 'region'
+    if col not in df.columns:
+        raise ValueError(f"Column '{col}' not found in DataFrame")
+
+    counts = table(df).group_by('Year').aggregate([(col, 'count_distinct')]).sort_by('Year')
+    return pd.DataFrame({
+        'Year': counts['Year'].to_numpy(),
+        'Count': counts[f'{col}_count_distinct'].to_numpy()
+    })
+
+
+def yearwise_medal_tally(medals, country):
+    t = where(table(medals), region=country)
+    counts = t.group_by('Year').aggregate([('Medal', 'count')]).sort_by('Year')
+    return pd.DataFrame({
+        'Year': counts['Year'].to_numpy().astype(medals['Year'].dtype),
+        'Medals': counts['Medal_count'].to_numpy()
+    })
+
+
+def country_event_heatmap(medals, country):
+    t = where(table(medals), region=country)
+    counts = t.group_by(['Sport', 'Year']).aggregate([('Medal', 'count')]).to_pandas()
+    counts['Sport'] = counts['Sport'].astype(medals['Sport'].dtype)
+    counts['Year'] = counts['Year'].astype(medals['Year'].dtype)
+    return counts.pivot_table(index='Sport', columns='Year', values='Medal_count',
+                              aggfunc='sum', fill_value=0, observed=True)
+
+
+def get_sport_stats(df, sport):
+    t = where(table(df), Sport=sport)
+    sex = pc.value_counts(t['Sex'])
+    gender = dict(zip(sex.field('values').to_pylist(), sex.field('counts').to_pylist()))
+    if isinstance(df['Sex'].dtype, pd.CategoricalDtype):
+        # value_counts() on a categorical reports unseen categories as 0
+        gender.update({s: 0 for s in df['Sex'].cat.categories if s not in gender})
+    gender = dict(sorted(((s, n) for s, n in gender.items() if s is not None),
+                         key=lambda item: -item[1]))
+
+    return {
+        'first_year': int(pc.min(t['Year']).as_py()),
+        'events': distinct(t['Event']),
+        'athletes': distinct(t['ID']),
+        'nations': distinct(t['region']),
+        'gender_ratio': gender
+    }
+
+
+def men_vs_women(df):
+    t = table(df)
+    athletes = t.take(first_rows(df, ['ID']))
+    counts = athletes.group_by(['Year', 'Sex']).aggregate([('ID', 'count')]).to_pandas()
+    counts['Year'] = counts['Year'].astype(df['Year'].dtype)
+    men = counts[counts['Sex'] == 'M'][['Year', 'ID_count']].sort_values('Year')
+    women = counts[counts['Sex'] == 'F'][['Year', 'ID_count']]
+
+    final = men.merge(women, on='Year', how='left').reset_index(drop=True)
+    final.fillna(0, inplace=True)
+    final.rename(columns={'ID_count_x': 'Male', 'ID_count_y': 'Female'}, inplace=True)
+
+    final['Total'] = final['Male'] + final['Female']
+    final['Male %'] = round((final['Male'] / final['Total'] * 100), 2)
+    final['Female %'] = round((final['Female'] / final['Total'] * 100), 2)
+    return final
+
+
+def weight_v_height(df, sport):
+    # Arrow picks the rows; gathering them from df keeps helper.weight_v_height's dtypes and index
+    t = table(df)
+    athletes = t.take(first_rows(df, ['ID', 'Games']))
+    mask = pc.and_(pc.greater(athletes['Weight'], 0), pc.greater(athletes['Height'], 0))
+    if sport != 'Overall':
+        mask = pc.and_(mask, pc.equal(athletes['Sport'], sport))
+    rows = athletes.filter(pc.fill_null(mask, False))['_row'].to_numpy()
+
+    athlete_df = df[['Weight', 'Height', 'Medal', 'Sex', 'Sport']].iloc[rows]
+    medal = athlete_df['Medal'].astype(object).where(athlete_df['Medal'].notna(), 'No Medal')
+    return athlete_df.assign(Medal=medal.astype(str))
+
+
+def most_successful_countrywise(medals, country):
+    t = where(table(medals), region=country)
+    per_sport = t.group_by(['ID', 'Sport']).aggregate([('Medal', 'count'), ('Name', 'min')])
+    per_sport = pa.table({
+        'ID': per_sport['ID'],
+        'Name': per_sport['Name_min'],
+        'Sport': pc.cast(per_sport['Sport'], pa.string()),
+        'Medals': per_sport['Medal_count']
+    }).sort_by([('ID', 'ascending'), ('Sport', 'ascending')])
+
+    # Single-threaded so each athlete's sports stay in sorted order
+    athletes = per_sport.group_by('ID', use_threads=False).aggregate(
+        [('Name', 'min'), ('Medals', 'sum'), ('Sport', 'list')])
+    athletes = pa.table({
+        'Name': athletes['Name_min'],
+        'Medals': athletes['Medals_sum'],
+        'Sport': pc.binary_join(athletes['Sport_list'], ', '),
+        'ID': athletes['ID']
+    }).sort_by([('Medals', 'descending'), ('ID', 'ascending')]).slice(0, 10).drop_columns(['ID'])
+
+    result = athletes.to_pandas()
+    result['Name'] = result['Name'].astype(medals['Name'].dtype)
+    return result
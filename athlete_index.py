@@ -0,0 +1,81 @@
+import numpy as np
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, eq=False)
+class AthleteIndex:
+    """Row offsets of every athlete in the athlete frame, grouped by integer ID"""
+    ids: np.ndarray  # sorted distinct IDs
+    starts: np.ndarray  # rows[starts[i]:starts[i + 1]] are the rows of ids[i]
+    rows: np.ndarray  # frame positions grouped by ID, in frame order within each ID
+
+
+def build_athlete_index(athletes):
+    """
+    Build the athlete index
+
+    Parameters:
+        athletes (pandas.DataFrame): Output of preprocessor.preprocess()
+
+    Returns:
+        AthleteIndex: Contiguous row offsets per athlete ID
+    """
+    ids = athletes['ID'].to_numpy()
+
+    # A stable sort keeps each athlete's rows in frame (Year) order
+    rows = np.argsort(ids, kind='stable')
+    sorted_ids = ids[rows]
+    boundaries = np.flatnonzero(sorted_ids[1:] != sorted_ids[:-1]) + 1
+    starts = np.concatenate(([0], boundaries, [len(ids)])) if len(ids) else np.zeros(1, dtype=np.int64)
+
+    index = AthleteIndex(ids=sorted_ids[starts[:-1]], starts=starts.astype(np.int64), rows=rows)
+    for arr in (index.ids, index.starts, index.rows):
+        arr.flags.writeable = False
+    return index
+
+
+def athlete_rows(index, athlete_id):
+    """
+    Frame positions of one athlete's rows
+
+    Parameters:
+        index (AthleteIndex): Index from build_athlete_index()
+        athlete_id (int): Athlete ID
+
+    Returns:
+        numpy.ndarray: Positions for athletes.iloc[], in frame order; empty if the ID is unknown
+    """
+    i = np.searchsorted(index.ids, athlete_id)
+    if i == len(index.ids) or index.ids[i] != athlete_id:
+        return index.rows[:0]
+    return index.rows[index.starts[i]:index.starts[i + 1]]
+
+
+def lookup(index, athletes, athlete_id):
+    """
+    Every row of one athlete
+
+    Parameters:
+        index (AthleteIndex): Index built over athletes
+        athletes (pandas.DataFrame): The indexed athlete frame
+        athlete_id (int): Athlete ID
+
+    Returns:
+        pandas.DataFrame: The athlete's rows in Year order
+    """
+    return athletes.iloc[athlete_rows(index, athlete_id)]
+
+
+def athlete_codes(index):
+    """
+    Dense athlete number of every row: the position of its ID in index.ids
+
+    Parameters:
+        index (AthleteIndex): Index from build_athlete_index()
+
+    Returns:
+        numpy.ndarray: One code per frame row, in frame order
+    """
+    codes = np.empty(len(index.rows), dtype=np.int64)
+    codes[index.rows] = np.repeat(np.arange(len(index.ids)), np.diff(index.starts))
+    return codes
@@ -0,0 +1,57 @@
+import functools
+import importlib
+import os
+
+# Compute engines for the helpers: name -> module with same-named implementations
+# (None is helper.py itself). Every engine returns the pandas results helper.py does;
+# an implementation returning NotImplemented hands that call back to pandas.
+# All of them run over the Dataset already loaded in RAM; 'sqlite' keeps an extra
+# copy on disk to query, it does not serve data larger than memory.
+BACKENDS = {
+    'pandas': None,
+    'arrow': 'arrow_backend',
+    'sqlite': 'sqlstore'
+}
+
+# Default engine, overridable per deployment via environment or configure()
+DEFAULT_BACKEND = os.environ.get('OLYMPICS_BACKEND', 'pandas')
+
+_current = {'name': 'pandas', 'module': None}
+
+
+def configure(name):
+    """
+    Select the engine the helpers run on
+
+    Parameters:
+        name (str): Key of BACKENDS
+
+    Raises:
+        ValueError: If name is not a known backend
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}', expected one of {sorted(BACKENDS)}")
+    module = importlib.import_module(BACKENDS[name]) if BACKENDS[name] else None
+    _current.update(name=name, module=module)
+
+
+def current():
+    """Name of the selected engine"""
+    return _current['name']
+
+
+def dispatch(func):
+    """Run a helper on the selected engine, falling back to pandas where it has no implementation or declines"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        impl = getattr(_current['module'], func.__name__, None)
+        if impl is not None:
+            result = impl(*args, **kwargs)
+            if result is not NotImplemented:
+                return result
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+configure(DEFAULT_BACKEND)
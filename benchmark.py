@@ -0,0 +1,374 @@
+"""
+Benchmark preprocessing, helper functions and page figure construction
+
+Times every stage on the source data scaled to 1x, 10x and 100x (by
+default), reporting median/p95 wall time and peak traced memory, and
+writes the results as JSON so runs can be compared.
+
+Usage:
+    python benchmark.py --scales 1 10 --repeat 5 --output before.json
+    python benchmark.py --output after.json --compare before.json --threshold 0.2
+"""
+import argparse
+import inspect
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import aggregates
+import athlete_index
+import backends
+import dataset
+import figures
+import helper
+import memo
+import preprocessor
+import sqlstore
+import summary
+import synthetic
+
+
+def scale_raw(df, factor):
+    """
+    Repeat the raw athlete events factor times as distinct athletes and events
+
+    Copies get new IDs, names and event names so preprocessing and the
+    medal table treat them as additional data rather than duplicates.
+
+    Parameters:
+        df (pandas.DataFrame): Raw athlete_events data
+        factor (int): Scale factor
+
+    Returns:
+        pandas.DataFrame: Scaled raw data
+    """
+    if factor == 1:
+        return df
+    id_step = int(df['ID'].max()) + 1
+    copies = [df]
+    for k in range(1, factor):
+        copies.append(df.assign(
+            ID=df['ID'] + k * id_step,
+            Name=df['Name'] + f' #{k}',
+            Event=df['Event'] + f' #{k}'
+        ))
+    return pd.concat(copies, ignore_index=True)
+
+
+def measure(func, repeat):
+    """Median/p95 wall time over repeat runs plus peak traced memory of one extra run"""
+    func()  # Warm-up: imports, plotly validators, first-touch allocations
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'median_ms': round(statistics.median(times) * 1000, 3),
+        'p95_ms': round(float(np.percentile(times, 95)) * 1000, 3),
+        'peak_mb': round(peak / 1e6, 3)
+    }
+
+
+def uncached(func):
+    """The helper underneath @profiler.traced and @memo.memoize, still run on the selected backend"""
+    return backends.dispatch(inspect.unwrap(func))
+
+
+def page_benchmarks(data, year, country, sport):
+    """Figure construction (including helper calls) for each app page, through the app's own builders"""
+    df = data.athletes
+
+    def medal_tally_page():
+        tally = aggregates.query_medal_tally(data.medal_cube, 'Overall', 'Overall').head(20)
+        figures.medal_bar(tally)
+        figures.medal_pie(tally)
+
+    def overall_page():
+        for col in figures.PARTICIPATION_CHARTS:
+            figures.participation_trend(data.summary.participation, col)
+        figures.events_heatmap(data.summary.events_heatmap)
+
+    def country_page():
+        profile = data.country_profiles[country]
+        figures.medal_timeline(profile.medal_timeline, country)
+        figures.sports_heatmap(profile.sport_heatmap, country)
+        figures.top_athletes(profile.top_athletes, country)
+        figures.gender_trend(aggregates.query_gender_trend(data.gender_cube, country=country),
+                             f'Athletes from {country} by Gender')
+
+    def athlete_page():
+        figures.age_histogram(data.age_summaries)
+        figures.age_by_medal(data.age_summaries)
+        figures.age_by_sport(data.age_summaries, sport)
+        figures.height_weight(df, uncached(helper.weight_v_height)(df, 'Overall'), 'Overall')
+        figures.gender_trend(aggregates.query_gender_trend(data.gender_cube), 'Gender Distribution in Olympics')
+
+    def sport_page():
+        gender_ratio = aggregates.query_sport_stats(data.sport_stats, sport)['gender_ratio']
+        total = gender_ratio['M'] + gender_ratio['F']
+        figures.sport_gender(round(gender_ratio['M'] / total * 100, 1), round(gender_ratio['F'] / total * 100, 1),
+                             sport)
+        figures.gender_trend(aggregates.query_gender_trend(data.gender_cube, sport=sport),
+                             f'{sport} Athletes by Gender Over Time')
+        figures.events_per_sport(data.summary.events_per_sport)
+
+    return {
+        'page:medal_tally': medal_tally_page,
+        'page:overall': overall_page,
+        'page:country': country_page,
+        'page:athlete': athlete_page,
+        'page:sport': sport_page
+    }
+
+
+def helper_benchmarks(data, year, country, sport):
+    """Every helper called directly, bypassing the memo cache"""
+    df, medals, cube = data.athletes, data.medals, data.medal_cube
+    athlete_id = int(df['ID'].mode().iloc[0])  # the athlete with the most rows
+    return {
+        'helper.country_year_list': lambda: uncached(helper.country_year_list)(df),
+        'helper.fetch_medal_tally[overall]': lambda: uncached(helper.fetch_medal_tally)(medals, 'Overall', 'Overall'),
+        'helper.fetch_medal_tally[year,country]': lambda: uncached(helper.fetch_medal_tally)(medals, year, country),
+        'helper.medal_tally': lambda: uncached(helper.medal_tally)(medals),
+        'helper.data_over_time[region]': lambda: uncached(helper.data_over_time)(df, 'region'),
+        'helper.data_over_time[Event]': lambda: uncached(helper.data_over_time)(df, 'Event'),
+        'helper.data_over_time[ID]': lambda: uncached(helper.data_over_time)(df, 'ID'),
+        'helper.most_successful[overall]': lambda: uncached(helper.most_successful)(df, 'Overall'),
+        'helper.most_successful[sport]': lambda: uncached(helper.most_successful)(df, sport),
+        'helper.yearwise_medal_tally': lambda: uncached(helper.yearwise_medal_tally)(medals, country),
+        'helper.country_event_heatmap': lambda: uncached(helper.country_event_heatmap)(medals, country),
+        'helper.most_successful_countrywise': lambda: uncached(helper.most_successful_countrywise)(medals, country),
+        'helper.get_sport_stats': lambda: uncached(helper.get_sport_stats)(df, sport),
+        'helper.men_vs_women': lambda: uncached(helper.men_vs_women)(df),
+        'helper.weight_v_height': lambda: uncached(helper.weight_v_height)(df, 'Overall'),
+        'helper.height_weight_density': lambda: uncached(helper.height_weight_density)(df, 'Overall'),
+        'aggregates.query_medal_tally': lambda: aggregates.query_medal_tally(cube, year, 'Overall'),
+        'athlete_index.build_athlete_index': lambda: athlete_index.build_athlete_index(df),
+        'athlete_index.lookup': lambda: athlete_index.lookup(data.athlete_index, df, athlete_id),
+        'summary.build_summary': lambda: summary.build_summary(df, data.athlete_index),
+        'summary.participation_trends': lambda: summary.participation_trends(df, data.athlete_index),
+        'aggregates.build_gender_cube': lambda: aggregates.build_gender_cube(df, data.athlete_index),
+        'aggregates.query_gender_trend[country]': lambda: aggregates.query_gender_trend(
+            data.gender_cube, country=country),
+        'aggregates.query_gender_trend[overall]': lambda: aggregates.query_gender_trend(data.gender_cube),
+        'aggregates.build_sport_stats': lambda: aggregates.build_sport_stats(df, medals),
+        'aggregates.query_sport_stats': lambda: aggregates.query_sport_stats(data.sport_stats, sport),
+        'aggregates.build_country_profiles': lambda: aggregates.build_country_profiles(
+            df, medals, data.athlete_index)
+    }
+
+
+def _rss_mb(field):
+    # Linux reports the current (VmRSS) and high-water (VmHWM) resident set in /proc
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field):
+                    return int(line.split()[1]) / 1e3
+    except OSError:
+        pass
+    return None
+
+
+def ingest(athlete_path, region_path, chunksize):
+    """
+    Preprocess one CSV from scratch; run in a fresh process so peak RSS is its own
+
+    Importing pandas, plotly and the app modules peaks above what a small
+    file needs, hiding the ingest itself under the high-water mark. Where
+    /proc allows it the mark is reset to the post-import RSS first, so
+    peak_rss_delta_mb is the growth the ingest path alone causes.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+    baseline = _rss_mb('VmRSS:') or preprocessor.peak_rss_mb()
+    start = time.perf_counter()
+    if chunksize:
+        df = preprocessor.preprocess_chunked(athlete_path, region_path, chunksize)
+    else:
+        df = preprocessor.compact(preprocessor.preprocess(pd.read_csv(athlete_path), pd.read_csv(region_path)))
+    elapsed = time.perf_counter() - start
+    peak = _rss_mb('VmHWM:') or preprocessor.peak_rss_mb()
+    return {
+        'median_ms': round(elapsed * 1000, 3),
+        'rows': len(df),
+        'baseline_rss_mb': baseline,
+        'peak_rss_mb': peak,
+        'peak_rss_delta_mb': round(peak - baseline, 3) if peak is not None else None
+    }
+
+
+def _or_nan(value):
+    return float('nan') if value is None else value
+
+
+def ingest_benchmarks(raw, region_path, scale, chunksize, tmp_dir):
+    """
+    Whole-file and chunked ingest of the scaled CSV, each in its own process
+
+    Returns:
+        list: One result per ingest path
+    """
+    path = os.path.join(tmp_dir, f'athlete_events-{scale}x.csv')
+    raw.to_csv(path, index=False)
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for name, size in [('ingest[read_csv]', None), (f'ingest[chunked {chunksize:,}]', chunksize)]:
+        with context.Pool(1) as pool:
+            result = pool.apply(ingest, (path, region_path, size))
+        results.append({'name': name, 'scale': scale, **result})
+    os.remove(path)
+    return results
+
+
+def run(athlete_path, region_path, scales, repeat, compact_dtypes=True, chunksize=None, workers=None,
+        log=print):
+    """
+    Run every benchmark at every scale
+
+    With chunksize set, also compares whole-file and chunked ingest of
+    the scaled CSV by wall time and peak RSS; with workers set, also
+    times preprocessing partitioned by Year on that many processes.
+
+    Returns:
+        list: One dict per (benchmark, scale)
+    """
+    raw = pd.read_csv(athlete_path)
+    regions = pd.read_csv(region_path)
+    results = []
+
+    # Results must not be served from the shared cache
+    memo.configure(max_entries=0)
+    store_dir = tempfile.mkdtemp()  # SQLite stores when that engine is selected
+
+    for scale in scales:
+        scaled = scale_raw(raw, scale)
+        log(f'scale {scale}x: {len(scaled):,} raw rows')
+
+        if chunksize:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                for result in ingest_benchmarks(scaled, region_path, scale, chunksize, tmp_dir):
+                    log(f"  {result['name']:<42} {result['median_ms']:>17.1f} ms  "
+                        f"peak RSS +{_or_nan(result['peak_rss_delta_mb']):>8.1f} MB "
+                        f"over {_or_nan(result['baseline_rss_mb']):.1f} MB after imports")
+                    results.append(result)
+
+        stages = {
+            'preprocess': lambda: preprocessor.preprocess(scaled, regions, compact_dtypes)
+        }
+        if workers:
+            stages[f'preprocess[parallel {workers}]'] = lambda: preprocessor.preprocess_parallel(
+                scaled, regions, compact_dtypes, workers)
+        athletes = stages['preprocess']()
+        stages['dataset.build_dataset'] = lambda: dataset.build_dataset(athletes.copy(), f'bench-{scale}')
+        data = dataset.build_dataset(athletes, f'bench-{scale}')
+        if backends.current() == 'sqlite':
+            store_path = os.path.join(store_dir, f'olympics-bench-{scale}.sqlite')
+            sqlstore.attach(data, sqlstore.build_store(athletes, store_path, data.version))
+
+        # Representative selections: latest edition, top nation, most common sport
+        year = data.medal_cube.years[-1]
+        country = aggregates.query_medal_tally(data.medal_cube, 'Overall', 'Overall')['region'].iloc[0]
+        sport = data.athletes['Sport'].astype(str).value_counts().index[0]
+
+        stages.update(helper_benchmarks(data, year, country, sport))
+        stages.update(page_benchmarks(data, year, country, sport))
+
+        for name, func in stages.items():
+            result = {'name': name, 'scale': scale, 'rows': len(athletes), **measure(func, repeat)}
+            log(f"  {name:<42} median {result['median_ms']:>10.1f} ms  "
+                f"p95 {result['p95_ms']:>10.1f} ms  peak {result['peak_mb']:>8.1f} MB")
+            results.append(result)
+
+    shutil.rmtree(store_dir, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Benchmarks whose median grew by more than threshold relative to baseline
+
+    Returns:
+        list: (name, scale, baseline median, current median) per regression
+    """
+    previous = {(r['name'], r['scale']): r['median_ms'] for r in baseline['results']}
+    regressions = []
+    for r in results:
+        before = previous.get((r['name'], r['scale']))
+        if before and r['median_ms'] > before * (1 + threshold):
+            regressions.append((r['name'], r['scale'], before, r['median_ms']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--athletes', default=synthetic.DEFAULT_OUTPUT,
+                        help='Athlete events CSV; the default is generated by synthetic.py when missing')
+    parser.add_argument('--regions', default='noc_regions.csv')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--ingest-chunksize', type=int,
+                        help='Also time whole-file vs chunked CSV ingest (peak RSS per process)')
+    parser.add_argument('--workers', type=int, help='Also time preprocess_parallel() on this many processes')
+    parser.add_argument('--backend', choices=sorted(backends.BACKENDS), default=backends.current(),
+                        help='Engine the helpers run on')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help='Earlier results JSON to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Flag medians slower than baseline by more than this fraction')
+    args = parser.parse_args(argv)
+    backends.configure(args.backend)
+    if args.athletes == synthetic.DEFAULT_OUTPUT:
+        synthetic.ensure(args.athletes, args.regions)
+
+    results = run(args.athletes, args.regions, args.scales, args.repeat, chunksize=args.ingest_chunksize,
+                  workers=args.workers)
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'backend': args.backend,
+            'repeat': args.repeat
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Wrote {args.output}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for name, scale, before, after in regressions:
+            print(f'REGRESSION {name} @ {scale}x: {before:.1f} ms -> {after:.1f} ms')
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
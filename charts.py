@@ -0,0 +1,213 @@
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# Point-count thresholds for scatter plots: SVG markers up to RAW_POINTS_LIMIT,
+# WebGL up to WEBGL_POINTS_LIMIT, server-side binned density beyond that
+RAW_POINTS_LIMIT = 5000
+WEBGL_POINTS_LIMIT = 50000
+
+
+def annotated_heatmap(pivot, title=None, x_title=None, y_title=None, colorbar_title=None,
+                      colorscale='Viridis', text_size=10):
+    """
+    Heatmap of a pivot table with cell values drawn by the trace itself
+
+    Labels go into the trace's text matrix rather than one layout
+    annotation per cell, so the figure stays one trace regardless of the
+    number of cells. Zero cells are left unlabelled.
+
+    Parameters:
+        pivot (pandas.DataFrame): Counts with rows on the y axis and columns on the x axis
+        title (str): Figure title
+        x_title (str): X axis title
+        y_title (str): Y axis title
+        colorbar_title (str): Colorbar title
+        colorscale (str): Plotly colorscale name
+        text_size (int): Font size of the cell labels
+
+    Returns:
+        plotly.graph_objects.Figure: Figure with a single Heatmap trace
+    """
+    z = pivot.to_numpy()
+    text = np.where(z > 0, z.astype(np.int64).astype(str), '')
+
+    fig = go.Figure(go.Heatmap(
+        z=z,
+        x=[str(col) for col in pivot.columns],
+        y=[str(row) for row in pivot.index],
+        text=text,
+        texttemplate='%{text}',
+        textfont=dict(color='white', size=text_size),
+        colorscale=colorscale,
+        colorbar=dict(title=dict(text=colorbar_title, font=dict(size=14)), tickfont=dict(size=12)),
+        hovertemplate=f'{x_title or "x"}: %{{x}}<br>{y_title or "y"}: %{{y}}<br>'
+                      f'{colorbar_title or "Value"}: %{{z}}<extra></extra>'
+    ))
+
+    # Match px.imshow orientation - first row at the top
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=24)),
+        xaxis=dict(title=x_title, type='category', tickangle=45, tickfont=dict(size=12)),
+        yaxis=dict(title=y_title, type='category', autorange='reversed', tickfont=dict(size=12))
+    )
+
+    return fig
+
+
+def scatter_mode(n_points):
+    """Pick 'svg', 'webgl' or 'density' rendering for a scatter of n_points"""
+    if n_points <= RAW_POINTS_LIMIT:
+        return 'svg'
+    if n_points <= WEBGL_POINTS_LIMIT:
+        return 'webgl'
+    return 'density'
+
+
+def density_facets(density, title=None, x_title=None, y_title=None, colorscale='Viridis'):
+    """
+    One binned-density heatmap per medal class, side by side
+
+    Parameters:
+        density (pandas.DataFrame): Output of helper.height_weight_density()
+        title (str): Figure title
+        x_title (str): X axis title
+        y_title (str): Y axis title
+        colorscale (str): Plotly colorscale name
+
+    Returns:
+        plotly.graph_objects.Figure: Figure with a Heatmap per medal class
+    """
+    classes = list(dict.fromkeys(density['Medal']))
+    weights = np.sort(density['Weight'].unique())
+    heights = np.sort(density['Height'].unique())
+
+    fig = make_subplots(rows=1, cols=max(len(classes), 1), shared_yaxes=True,
+                        subplot_titles=classes, horizontal_spacing=0.02)
+    for col, medal_class in enumerate(classes, start=1):
+        # Same full grid for every class; empty bins become NaN and render transparent
+        subset = density[density['Medal'] == medal_class]
+        share = subset.pivot(index='Height', columns='Weight', values='Share').reindex(index=heights, columns=weights)
+        count = subset.pivot(index='Height', columns='Weight', values='Count').reindex(index=heights, columns=weights)
+        fig.add_trace(go.Heatmap(
+            z=share.to_numpy(),
+            x=weights,
+            y=heights,
+            customdata=count.to_numpy(),
+            coloraxis='coloraxis',
+            hovertemplate=f'{medal_class}<br>{x_title or "x"}: %{{x}}<br>{y_title or "y"}: %{{y}}'
+                          '<br>Athletes: %{customdata}<br>Share: %{z:.2f}%<extra></extra>'
+        ), row=1, col=col)
+        fig.update_xaxes(title_text=x_title, row=1, col=col)
+
+    fig.update_yaxes(title_text=y_title, row=1, col=1)
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=24)),
+        coloraxis=dict(colorscale=colorscale, colorbar=dict(title=dict(text='% of class')))
+    )
+    return fig
+
+
+def summary_histogram(summary, title=None, x_title=None, y_title='Count'):
+    """
+    Bar histogram from a precomputed distributions.AgeSummary
+
+    Parameters:
+        summary (AgeSummary): Distribution to draw, one bar per integer age
+        title (str): Figure title
+        x_title (str): X axis title
+        y_title (str): Y axis title
+
+    Returns:
+        plotly.graph_objects.Figure: Figure with a single Bar trace
+    """
+    fig = go.Figure(go.Bar(x=summary.ages, y=summary.counts, width=1, marker_line_width=0))
+    fig.update_layout(
+        title=dict(text=title),
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        bargap=0
+    )
+    return fig
+
+
+def summary_violins(summaries, categories, series=(None,), title=None, y_title=None,
+                    category_labels=None, colors=None):
+    """
+    Violin plots drawn from precomputed distributions.AgeSummary objects
+
+    Each violin is the summary's KDE mirrored as a filled outline, with a
+    box built from its precomputed quartiles and fences, so no raw values
+    are sent to the browser.
+
+    Parameters:
+        summaries (dict): (category, series) -> AgeSummary; missing keys are skipped
+        categories (list): Groups along the x axis
+        series (list): Sub-groups drawn side by side within each category
+        title (str): Figure title
+        y_title (str): Y axis title
+        category_labels (dict): Display names for categories
+        colors (dict): Series -> colour
+
+    Returns:
+        plotly.graph_objects.Figure: Figure with a violin outline and box per group
+    """
+    palette = ['#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A', '#19D3F3']
+    colors = colors or {}
+    category_labels = category_labels or {}
+    slot = 0.8 / len(series)
+    fig = go.Figure()
+
+    for j, name in enumerate(series):
+        present = [(i, summaries[(c, name)]) for i, c in enumerate(categories) if (c, name) in summaries]
+        if not present:
+            continue
+        color = colors.get(name, palette[j % len(palette)])
+        label = str(name) if name is not None else None
+
+        # All outlines of a series in one trace, polygons separated by None
+        xs, ys, centres = [], [], []
+        for i, summary in present:
+            centre = i - 0.4 + (j + 0.5) * slot
+            half_width = 0.45 * slot * summary.kde_density / summary.kde_density.max()
+            xs += list(np.round(np.concatenate([centre - half_width, (centre + half_width)[::-1]]), 3)) + [None]
+            ys += list(np.round(np.concatenate([summary.kde_ages, summary.kde_ages[::-1]]), 2)) + [None]
+            centres.append(centre)
+
+        fig.add_trace(go.Scatter(
+            x=xs,
+            y=ys,
+            fill='toself',
+            mode='lines',
+            line=dict(color=color, width=1),
+            name=label,
+            legendgroup=label,
+            showlegend=label is not None,
+            hoverinfo='skip'
+        ))
+        fig.add_trace(go.Box(
+            x=centres,
+            q1=[s.q1 for _, s in present],
+            median=[s.median for _, s in present],
+            q3=[s.q3 for _, s in present],
+            lowerfence=[s.lowerfence for _, s in present],
+            upperfence=[s.upperfence for _, s in present],
+            mean=[round(s.mean, 2) for _, s in present],
+            width=slot * 0.2,
+            marker_color=color,
+            name=label,
+            legendgroup=label,
+            showlegend=False
+        ))
+
+    fig.update_layout(
+        title=dict(text=title),
+        yaxis_title=y_title,
+        showlegend=any(name is not None for name in series),
+        xaxis=dict(
+            tickmode='array',
+            tickvals=list(range(len(categories))),
+            ticktext=[category_labels.get(c, c) for c in categories]
+        )
+    )
+    return fig
@@ -0,0 +1,172 @@
+import pandas as pd
+from dataclasses import dataclass
+
+import aggregates
+import athlete_index
+import distributions
+import memo
+import preprocessor
+import summary
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Everything derived from one version of the source files, shared read-only across sessions"""
+    version: str
+    athletes: pd.DataFrame
+    medals: pd.DataFrame
+    medal_cube: aggregates.MedalCube
+    gender_cube: aggregates.GenderCube
+    sport_stats: pd.DataFrame
+    country_profiles: dict
+    age_summaries: dict
+    athlete_index: athlete_index.AthleteIndex
+    summary: summary.DatasetSummary
+
+
+def freeze_summary(dataset_summary):
+    """Freeze the tables of a DatasetSummary, which every session shares"""
+    memo.freeze(dataset_summary.participation)
+    memo.freeze(dataset_summary.events_per_sport)
+    memo.freeze(dataset_summary.events_heatmap)
+    return dataset_summary
+
+
+def freeze_profiles(profiles):
+    """Freeze the tables of every CountryProfile, which every session shares"""
+    for profile in profiles.values():
+        memo.freeze(profile.medal_timeline)
+        memo.freeze(profile.sport_heatmap)
+        memo.freeze(profile.top_athletes)
+    return profiles
+
+
+def load_dataset(athlete_path='athlete_events.csv', region_path='noc_regions.csv',
+                 snapshot_dir='.snapshots', compact_dtypes=True, chunksize=100_000, workers=None):
+    """
+    Load the preprocessed data and everything derived from it
+
+    Parameters:
+        athlete_path (str): CSV with athlete events data
+        region_path (str): CSV with NOC region mappings
+        snapshot_dir (str): Directory for preprocessor snapshots
+        compact_dtypes (bool): Use the compact representation
+        chunksize (int): Rows per chunk when rebuilding the compact snapshot; None reads the CSV whole
+        workers (int): Rebuild on a process pool partitioned by Year instead of in chunks
+
+    Returns:
+        Dataset: Frozen dataset keyed by the source fingerprint
+    """
+    version = preprocessor.source_fingerprint(athlete_path, region_path)
+    athletes = preprocessor.load_preprocessed(athlete_path, region_path, snapshot_dir,
+                                              compact_dtypes, key=version, chunksize=chunksize,
+                                              workers=workers)
+    return build_dataset(athletes, version)
+
+
+def build_dataset(athletes, version):
+    """
+    Derive every shared structure from a preprocessed athlete frame
+
+    Parameters:
+        athletes (pandas.DataFrame): Output of preprocessor.preprocess()
+        version (str): Token identifying the contents of athletes
+
+    Returns:
+        Dataset: Frozen dataset
+    """
+    medals = preprocessor.medal_events(athletes)
+    medal_cube = aggregates.build_medal_cube(medals)
+    medal_cube.counts.flags.writeable = False
+
+    # Memoized helpers key on these frames by version, not contents
+    memo.register(athletes, f'{version}:athletes')
+    memo.register(medals, f'{version}:medals')
+
+    index = athlete_index.build_athlete_index(athletes)
+    gender_cube = aggregates.build_gender_cube(athletes, index)
+    for counts in (gender_cube.counts, gender_cube.region_athletes, gender_cube.athletes):
+        counts.flags.writeable = False
+
+    return Dataset(
+        version=version,
+        athletes=memo.freeze(athletes),
+        medals=memo.freeze(medals),
+        medal_cube=medal_cube,
+        gender_cube=gender_cube,
+        sport_stats=memo.freeze(aggregates.build_sport_stats(athletes, medals)),
+        country_profiles=freeze_profiles(aggregates.build_country_profiles(athletes, medals, index)),
+        age_summaries=distributions.build_age_summaries(athletes),
+        athlete_index=index,
+        summary=freeze_summary(summary.build_summary(athletes, index))
+    )
+
+
+def extend_dataset(data, added, version):
+    """
+    Dataset with extra preprocessed rows, derived by applying deltas
+
+    The added rows (a new edition, say) are preprocessed on their own;
+    the medal and gender cubes and age summaries are updated from the added
+    rows alone, and sport statistics and country profiles are recomputed
+    only for the sports and regions the added rows touch.
+
+    Parameters:
+        data (Dataset): Existing dataset
+        added (pandas.DataFrame): Compact preprocessed rows of editions not in data
+        version (str): Token identifying the combined contents
+
+    Returns:
+        Dataset: Frozen dataset equal to build_dataset() over all rows
+    """
+    added_medals = preprocessor.medal_events(added)
+
+    # Stable sorts keep every year's rows in arrival order, as a full rebuild would
+    athletes = preprocessor.concat_compact([data.athletes, added]).sort_values('Year', kind='stable')
+    medals = preprocessor.concat_compact([data.medals, added_medals]).sort_values('Year', kind='stable')
+    medal_cube = aggregates.merge_medal_cubes(data.medal_cube, aggregates.build_medal_cube(added_medals))
+    medal_cube.counts.flags.writeable = False
+    gender_cube = aggregates.merge_gender_cubes(
+        data.gender_cube, aggregates.build_gender_cube(added, athlete_index.build_athlete_index(added))
+    )
+    for counts in (gender_cube.counts, gender_cube.region_athletes, gender_cube.athletes):
+        counts.flags.writeable = False
+
+    memo.register(athletes, f'{version}:athletes')
+    memo.register(medals, f'{version}:medals')
+
+    index = athlete_index.build_athlete_index(athletes)
+    return Dataset(
+        version=version,
+        athletes=memo.freeze(athletes),
+        medals=memo.freeze(medals),
+        medal_cube=medal_cube,
+        gender_cube=gender_cube,
+        sport_stats=memo.freeze(_extend_sport_stats(data.sport_stats, athletes, medals, added)),
+        country_profiles=freeze_profiles(_extend_profiles(data.country_profiles, athletes, medals, added)),
+        age_summaries=distributions.merge_age_summaries(
+            data.age_summaries, distributions.build_age_summaries(added)
+        ),
+        # Row positions shift when the new rows sort into place, so the index is rebuilt
+        athlete_index=index,
+        # Headline distinct counts need the full history; the summary works on category codes and is cheap
+        summary=freeze_summary(summary.build_summary(athletes, index))
+    )
+
+
+def _extend_sport_stats(stats, athletes, medals, added):
+    # Distinct counts span editions, so touched sports are recomputed over their full history
+    touched = added['Sport'].dropna().unique()
+    fresh = aggregates.build_sport_stats(athletes[athletes['Sport'].isin(touched)],
+                                         medals[medals['Sport'].isin(touched)])
+    return pd.concat([stats.drop(fresh.index, errors='ignore'), fresh]).sort_index()
+
+
+def _extend_profiles(profiles, athletes, medals, added):
+    # Regions without rows in the added editions keep their profile as it was
+    touched = added['region'].dropna().unique()
+    rows = athletes['region'].isin(touched)
+    fresh = aggregates.build_country_profiles(athletes[rows], medals[medals['region'].isin(touched)],
+                                              athlete_index.build_athlete_index(athletes[rows]))
+    merged = {**profiles, **fresh}
+    return {region: merged[region] for region in sorted(merged)}
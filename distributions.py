@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+MEDAL_CLASSES = ['Gold', 'Silver', 'Bronze', 'No Medal']
+KDE_POINTS = 60
+
+
+@dataclass(frozen=True)
+class AgeSummary:
+    """Precomputed age distribution of one (sport, sex, medal) group"""
+    n: int
+    mean: float
+    min: float
+    q1: float
+    median: float
+    q3: float
+    max: float
+    lowerfence: float
+    upperfence: float
+    ages: np.ndarray  # integer ages with at least one athlete
+    counts: np.ndarray  # athletes per age in ages
+    kde_ages: np.ndarray  # evaluation grid of the KDE
+    kde_density: np.ndarray  # Gaussian KDE on kde_ages, integrates to 1
+
+
+def build_age_summaries(df):
+    """
+    Summaries of the Age column for every (sport, sex, medal) combination
+
+    Ages are whole years, so one grouped count per (sport, sex, medal, age)
+    is enough to derive histograms, quantiles and KDEs for every group and
+    every roll-up without revisiting the rows.
+
+    Parameters:
+        df (pandas.DataFrame): Athlete DataFrame
+
+    Returns:
+        dict: (sport, sex, medal) -> AgeSummary, with 'Overall' as the
+        sport roll-up and 'All' as the sex and medal roll-ups. Groups
+        without any known age are omitted.
+    """
+    age = pd.to_numeric(df['Age'], errors='coerce').astype(float)
+    valid = (age > 0).to_numpy()  # NaN compares False, 0 is the missing sentinel outside compact mode
+
+    sports = sorted(df['Sport'].astype(str).unique())
+    sexes = sorted(df['Sex'].astype(str).unique())
+    medal = df['Medal'].astype(object).where(df['Medal'].notna(), 'No Medal').astype(str)
+
+    sport_idx = pd.Categorical(df['Sport'].astype(str), categories=sports).codes[valid]
+    sex_idx = pd.Categorical(df['Sex'].astype(str), categories=sexes).codes[valid]
+    medal_idx = pd.Categorical(medal, categories=MEDAL_CLASSES).codes[valid]
+    age_idx = age.to_numpy()[valid].astype(np.int64)
+
+    # One pass: counts[sport, sex, medal, age]
+    shape = (len(sports), len(sexes), len(MEDAL_CLASSES), int(age_idx.max(initial=0)) + 1)
+    flat = np.ravel_multi_index((sport_idx, sex_idx, medal_idx, age_idx), shape)
+    counts = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+
+    sport_keys = [('Overall', slice(None))] + [(s, i) for i, s in enumerate(sports)]
+    sex_keys = [('All', slice(None))] + [(s, i) for i, s in enumerate(sexes)]
+    medal_keys = [('All', slice(None))] + [(m, i) for i, m in enumerate(MEDAL_CLASSES)]
+
+    summaries = {}
+    for sport, si in sport_keys:
+        for sex, xi in sex_keys:
+            for medal_class, mi in medal_keys:
+                age_counts = counts[si, xi, mi].reshape(-1, shape[-1]).sum(axis=0)
+                if age_counts.sum() > 0:
+                    summaries[(sport, sex, medal_class)] = summarize(age_counts)
+    return summaries
+
+
+def merge_age_summaries(summaries, delta):
+    """
+    Fold the summaries of added rows into existing ones
+
+    Only groups present in delta are re-summarized; every other summary is
+    carried over as the same object.
+
+    Parameters:
+        summaries (dict): Output of build_age_summaries() for the existing rows
+        delta (dict): Output of build_age_summaries() for the added rows
+
+    Returns:
+        dict: Same as build_age_summaries() over all rows
+    """
+    merged = dict(summaries)
+    for key, added in delta.items():
+        existing = summaries.get(key)
+        if existing is None:
+            merged[key] = added
+            continue
+        age_counts = np.zeros(int(max(existing.ages.max(), added.ages.max())) + 1, dtype=np.int64)
+        age_counts[existing.ages] += existing.counts
+        age_counts[added.ages] += added.counts
+        merged[key] = summarize(age_counts)
+    return merged
+
+
+def summarize(age_counts):
+    """
+    Histogram, box statistics and KDE from counts per integer age
+
+    Parameters:
+        age_counts (numpy.ndarray): age_counts[a] = number of athletes aged a
+
+    Returns:
+        AgeSummary: Summary of the distribution
+    """
+    ages = np.nonzero(age_counts)[0]
+    counts = age_counts[ages]
+    n = int(counts.sum())
+    mean = float((ages * counts).sum() / n)
+    std = float(np.sqrt((counts * (ages - mean) ** 2).sum() / n))
+
+    # Quantiles straight from the cumulative counts
+    cumulative = np.cumsum(counts)
+    q1, median, q3 = (float(ages[np.searchsorted(cumulative, q * n)]) for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    lowerfence = float(ages[ages >= q1 - 1.5 * iqr].min())
+    upperfence = float(ages[ages <= q3 + 1.5 * iqr].max())
+
+    # Gaussian KDE with Scott's bandwidth, weighted by the count at each age
+    bandwidth = max(std, 0.5) * n ** (-1 / 5)
+    kde_ages = np.linspace(ages.min() - 2 * bandwidth, ages.max() + 2 * bandwidth, KDE_POINTS)
+    z = (kde_ages[:, None] - ages[None, :]) / bandwidth
+    kde_density = (np.exp(-0.5 * z ** 2) * counts).sum(axis=1) / (n * bandwidth * np.sqrt(2 * np.pi))
+
+    return AgeSummary(
+        n=n, mean=mean, min=float(ages.min()), q1=q1, median=median, q3=q3,
+        max=float(ages.max()), lowerfence=lowerfence, upperfence=upperfence,
+        ages=ages, counts=counts, kde_ages=kde_ages, kde_density=kde_density
+    )
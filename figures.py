@@ -0,0 +1,312 @@
+import plotly.express as px
+
+import charts
+import distributions
+import helper
+
+# Default Plotly layout settings with dark theme
+DEFAULT_LAYOUT = dict(
+    plot_bgcolor="#1e1e1e",  # Dark background
+    paper_bgcolor="#1e1e1e",
+    height=700,
+    width=None,
+    margin=dict(t=80, l=80, r=40, b=80),
+    font=dict(
+        size=16,
+        color="#ffffff",  # White text
+        family="Arial, sans-serif"
+    ),
+    title=dict(
+        font=dict(size=24, color="#ffffff", family="Arial, sans-serif"),
+        y=0.95,
+        x=0.5,
+        xanchor='center',
+        yanchor='top'
+    ),
+    showlegend=True,
+    legend=dict(
+        bgcolor="rgba(30, 30, 30, 0.9)",
+        bordercolor="#404040",
+        borderwidth=1,
+        font=dict(size=14, family="Arial, sans-serif", color="#ffffff"),
+        yanchor="top",
+        y=0.99,
+        xanchor="left",
+        x=1.02
+    ),
+    xaxis=dict(
+        showgrid=True,
+        gridcolor='#404040',
+        gridwidth=1,
+        linecolor='#ffffff',
+        linewidth=2,
+        tickfont=dict(size=14, family="Arial, sans-serif", color="#ffffff"),
+        title_font=dict(size=18, family="Arial, sans-serif", color="#ffffff"),
+        tickangle=30
+    ),
+    yaxis=dict(
+        showgrid=True,
+        gridcolor='#404040',
+        gridwidth=1,
+        linecolor='#ffffff',
+        linewidth=2,
+        tickfont=dict(size=14, family="Arial, sans-serif", color="#ffffff"),
+        title_font=dict(size=18, family="Arial, sans-serif", color="#ffffff")
+    )
+)
+
+# Participation trend charts of the Overall Analysis tabs: column -> (title, axis label)
+PARTICIPATION_CHARTS = {
+    'region': ('Participating Nations Over Time', 'Number of Countries'),
+    'Event': ('Olympic Events Over Time', 'Number of Events'),
+    'ID': ('Athletes Participation Over Time', 'Number of Athletes')
+}
+
+MEDAL_COLORS = {'Gold': 'gold', 'Silver': 'silver', 'Bronze': '#cd7f32'}
+
+
+def medal_bar(medal_tally):
+    """Grouped Gold/Silver/Bronze bars per nation of the Medal Tally page"""
+    fig = px.bar(medal_tally,
+                 x='region' if 'region' in medal_tally.columns else 'NOC',
+                 y=['Gold', 'Silver', 'Bronze'],
+                 title='Medal Distribution by Country',
+                 labels={'value': 'Number of Medals', 'variable': 'Medal Type'},
+                 color_discrete_map=MEDAL_COLORS)
+    fig.update_layout(
+        barmode='group',
+        xaxis_tickangle=-45,
+        height=500,
+        legend_title_text='Medal Type',
+        showlegend=True
+    )
+    return fig
+
+
+def medal_pie(medal_tally):
+    """Share of total medals per nation of the Medal Tally page"""
+    fig = px.pie(medal_tally,
+                 values='Total',
+                 names='region' if 'region' in medal_tally.columns else 'NOC',
+                 title='Share of Total Olympic Medals',
+                 hole=0.3)
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+
+def participation_trend(participation, col):
+    """
+    Distinct values of one column per edition
+
+    Parameters:
+        participation (pandas.DataFrame): DatasetSummary.participation
+        col (str): Key of PARTICIPATION_CHARTS
+
+    Returns:
+        plotly.graph_objects.Figure: Line chart over Year
+    """
+    title, label = PARTICIPATION_CHARTS[col]
+    fig = px.line(participation, x='Year', y=col, title=title, labels={col: label})
+    fig.update_layout(plot_bgcolor='white')
+    fig.update_layout(DEFAULT_LAYOUT)
+    return fig
+
+
+def events_heatmap(pivot):
+    """Events per sport and edition, sized to the number of sports"""
+    fig = charts.annotated_heatmap(
+        pivot,
+        title='Number of Events per Sport Over Time',
+        x_title='Year',
+        y_title='Sport',
+        colorbar_title='Number of Events'
+    )
+    fig.update_layout(height=max(600, len(pivot.index) * 25))  # Dynamic height based on number of sports
+    fig.update_layout(DEFAULT_LAYOUT)
+    return fig
+
+
+def medal_timeline(timeline, country):
+    """Medals per edition of one nation"""
+    fig = px.line(timeline, x='Year', y='Medals',
+                  title=f'Medal Timeline for {country}',
+                  labels={'Medals': 'Number of Medals'})
+
+    # Update layout for better visibility
+    fig.update_traces(
+        line=dict(width=3),
+        mode='lines+markers',
+        marker=dict(size=8)
+    )
+    fig.update_layout(
+        xaxis_title="Year",
+        yaxis_title="Number of Medals",
+        showlegend=False,
+        hovermode='x unified'
+    )
+    fig.update_layout(DEFAULT_LAYOUT)
+    return fig
+
+
+def sports_heatmap(heatmap, country):
+    """Medals per sport and edition of one nation"""
+    fig = charts.annotated_heatmap(
+        heatmap,
+        title=f'{country}\'s Performance in Different Sports',
+        x_title='Year',
+        y_title='Sport',
+        colorbar_title='Medals',
+        colorscale='Plasma'
+    )
+    fig.update_layout(plot_bgcolor='white')
+    fig.update_layout(DEFAULT_LAYOUT)
+    return fig
+
+
+def top_athletes(athletes, country):
+    """Medals of a nation's most decorated athletes"""
+    fig = px.bar(
+        athletes.head(10),
+        x='Name',
+        y='Medals',
+        text='Medals',
+        hover_data=['Sport'],
+        title=f'Top 10 Athletes from {country}'
+    )
+    fig.update_layout(
+        plot_bgcolor='white',
+        xaxis_title="Athlete",
+        yaxis_title="Number of Medals"
+    )
+    fig.update_layout(DEFAULT_LAYOUT)
+    return fig
+
+
+def gender_trend(trend, title):
+    """Male and female athletes per edition, from aggregates.query_gender_trend()"""
+    fig = px.line(
+        trend,
+        x='Year',
+        y=['Male', 'Female'],
+        title=title,
+        labels={'value': 'Number of Athletes', 'variable': 'Gender'}
+    )
+    fig.update_layout(plot_bgcolor='white')
+    fig.update_layout(DEFAULT_LAYOUT)
+    return fig
+
+
+def age_histogram(age_summaries):
+    """Age histogram of every athlete"""
+    fig = charts.summary_histogram(
+        age_summaries[('Overall', 'All', 'All')],
+        title='Overall Age Distribution',
+        x_title='Age'
+    )
+    fig.update_layout(plot_bgcolor='white')
+    fig.update_layout(DEFAULT_LAYOUT)
+    return fig
+
+
+def age_by_medal(age_summaries):
+    """Age violins of medal winners per medal type"""
+    medal_summaries = {
+        (medal, None): age_summaries[('Overall', 'All', medal)]
+        for medal in ['Gold', 'Silver', 'Bronze']
+        if ('Overall', 'All', medal) in age_summaries
+    }
+    fig = charts.summary_violins(
+        medal_summaries,
+        categories=['Gold', 'Silver', 'Bronze'],
+        title='Age Distribution by Medal Type',
+        y_title='Age',
+        colors={None: '#636EFA'}
+    )
+    fig.update_layout(plot_bgcolor='white')
+    fig.update_layout(DEFAULT_LAYOUT)
+    return fig
+
+
+def age_by_sport(age_summaries, sport):
+    """Age violins of one sport per sex and medal class"""
+    sport_summaries = {
+        (sex, medal): age_summaries[(sport, sex, medal)]
+        for sex in ['M', 'F']
+        for medal in distributions.MEDAL_CLASSES
+        if (sport, sex, medal) in age_summaries
+    }
+    fig = charts.summary_violins(
+        sport_summaries,
+        categories=['M', 'F'],
+        series=distributions.MEDAL_CLASSES,
+        title=f'Age Distribution for {sport}',
+        y_title='Age (years)',
+        category_labels={'M': 'Male', 'F': 'Female'},
+        colors={**MEDAL_COLORS, 'No Medal': '#636EFA'}
+    )
+    fig.update_layout(plot_bgcolor='white', xaxis_title='Gender')
+    fig.update_layout(DEFAULT_LAYOUT)
+    return fig
+
+
+def height_weight(df, physical, sport):
+    """
+    Height vs Weight of one sport's athletes
+
+    Raw points for small slices, WebGL for mid-sized ones and a binned
+    density beyond that, per charts.scatter_mode().
+
+    Parameters:
+        df (pandas.DataFrame): Shared athlete frame, for the density helper
+        physical (pandas.DataFrame): helper.weight_v_height(df, sport)
+        sport (str): Sport name or 'Overall'
+
+    Returns:
+        plotly.graph_objects.Figure: Scatter or density facets
+    """
+    scatter_mode = charts.scatter_mode(len(physical))
+    if scatter_mode == 'density':
+        fig = charts.density_facets(
+            helper.height_weight_density(df, sport),
+            title=f'Height vs Weight Density for {sport}',
+            x_title='Weight (kg)',
+            y_title='Height (cm)'
+        )
+    else:
+        fig = px.scatter(
+            physical,
+            x='Weight',
+            y='Height',
+            color='Sex',
+            symbol='Medal',
+            render_mode=scatter_mode,
+            title=f'Height vs Weight Distribution for {sport}',
+            labels={
+                'Weight': 'Weight (kg)',
+                'Height': 'Height (cm)',
+                'Sex': 'Gender'
+            }
+        )
+    fig.update_layout(plot_bgcolor='white')
+    fig.update_layout(DEFAULT_LAYOUT)
+    return fig
+
+
+def events_per_sport(counts):
+    """Distinct events per sport, from DatasetSummary.events_per_sport"""
+    fig = px.bar(counts,
+                 orientation='h',
+                 title='Number of Events by Sport',
+                 labels={'Sport': 'Sport', 'Event': 'Number of Events'})
+    fig.update_layout(DEFAULT_LAYOUT)
+    return fig
+
+
+def sport_gender(male_percent, female_percent, sport):
+    """Male/female share of one sport's athletes"""
+    fig = px.pie(values=[male_percent, female_percent],
+                 names=['Male', 'Female'],
+                 title=f'Gender Distribution in {sport}')
+    fig.update_traces(textinfo='percent+label')
+    fig.update_layout(DEFAULT_LAYOUT)
+    return fig
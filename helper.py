@@ -2,6 +2,10 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 
+import backends
+import memo
+import profiler
+
 def preprocess_data(df, df_region):
     # Merge with region data
     df = df.merge(df_region, on='NOC', how='left')
@@ -26,6 +30,9 @@ def preprocess_data(df, df_region):
     
     return df
 
+@profiler.traced
+@memo.memoize
+@backends.dispatch
 def country_year_list(df):
     years = df['Year'].unique().tolist()
     years.sort()
@@ -37,26 +44,23 @@ def country_year_list(df):
     
     return years, countries
 
-def fetch_medal_tally(df, year, country):
-    """Fetch medal tally for specific year and/or country with team event handling"""
-    # Remove duplicates for team events
-    medal_df = df.drop_duplicates(subset=['Team', 'NOC', 'Games', 'Year', 'Sport', 'Event', 'Medal'])
-    
-    # Filter for rows with medals
-    medal_df = medal_df[medal_df['Medal'].notna()]
-    
+@profiler.traced
+@memo.memoize
+@backends.dispatch
+def fetch_medal_tally(medals, year, country):
+    """Fetch medal tally for specific year and/or country from the medal fact table"""
     # Apply filters
     if year == 'Overall' and country == 'Overall':
-        temp_df = medal_df
+        temp_df = medals
     elif year == 'Overall' and country != 'Overall':
-        temp_df = medal_df[medal_df['region'] == country]
+        temp_df = medals[medals['region'] == country]
     elif year != 'Overall' and country == 'Overall':
-        temp_df = medal_df[medal_df['Year'] == int(year)]
+        temp_df = medals[medals['Year'] == int(year)]
     else:
-        temp_df = medal_df[(medal_df['Year'] == int(year)) & (medal_df['region'] == country)]
+        temp_df = medals[(medals['Year'] == int(year)) & (medals['region'] == country)]
     
     # Calculate medal counts
-    medal_tally = temp_df.groupby('region')[['Gold', 'Silver', 'Bronze']].sum()
+    medal_tally = temp_df.groupby('region', observed=True)[['Gold', 'Silver', 'Bronze']].sum()
     medal_tally['Total'] = medal_tally['Gold'] + medal_tally['Silver'] + medal_tally['Bronze']
     
     # Sort results
@@ -67,6 +71,9 @@ def fetch_medal_tally(df, year, country):
     
     return medal_tally
 
+@profiler.traced
+@memo.memoize
+@backends.dispatch
 def data_over_time(df, col):
     """
     Analyze how a column changes over time
@@ -88,6 +95,8 @@ def data_over_time(df, col):
     result_df.rename(columns={col: 'Count'}, inplace=True)
     return result_df
 
+@profiler.traced
+@memo.memoize
 def most_successful(df, sport):
     """Find most successful athletes in a sport"""
     temp_df = df.dropna(subset=['Medal'])
@@ -95,24 +104,21 @@ def most_successful(df, sport):
     if sport != 'Overall':
         temp_df = temp_df[temp_df['Sport'] == sport]
     
-    x = temp_df['Name'].value_counts().reset_index().head(15)
-    x = x.merge(df, left_on='index', right_on='Name', how='left')[['index', 'Name_x', 'Sport', 'region']].drop_duplicates('index')
+    # Count per athlete ID so namesakes stay separate, then attach each athlete's first row
+    x = temp_df['ID'].value_counts().rename('Medals').head(15).reset_index()
+    x = x.merge(df.drop_duplicates('ID')[['ID', 'Name', 'Sport', 'region']], on='ID', how='left')
     x.rename(columns={
-        'index': 'Name',
-        'Name_x': 'Medals',
         'Sport': 'Sport(s)',
         'region': 'Country'
     }, inplace=True)
-    return x
+    return x[['Name', 'Medals', 'Sport(s)', 'Country']]
 
-def yearwise_medal_tally(df, country):
-    """Calculate year-wise medal counts for a country, handling team events correctly"""
-    # Filter for the selected country first
-    temp_df = df[df['region'] == country].copy()
-    
-    # Filter for actual medals and deduplicate using Event_ID
-    temp_df = temp_df[temp_df['Medal'].isin(['Gold', 'Silver', 'Bronze'])]
-    temp_df = temp_df.drop_duplicates(subset=['Event_ID', 'Medal'])
+@profiler.traced
+@memo.memoize
+@backends.dispatch
+def yearwise_medal_tally(medals, country):
+    """Calculate year-wise medal counts for a country from the medal fact table"""
+    temp_df = medals[medals['region'] == country]
     
     # Group by year and count medals
     final_df = temp_df.groupby('Year').agg({
@@ -122,14 +128,12 @@ def yearwise_medal_tally(df, country):
     final_df.rename(columns={'Medal': 'Medals'}, inplace=True)
     return final_df
 
-def country_event_heatmap(df, country):
+@profiler.traced
+@memo.memoize
+@backends.dispatch
+def country_event_heatmap(medals, country):
     """Create heatmap data for country's performance in different sports"""
-    # Filter for the selected country first
-    temp_df = df[df['region'] == country].copy()
-    
-    # Filter for actual medals and deduplicate using Event_ID
-    temp_df = temp_df[temp_df['Medal'].isin(['Gold', 'Silver', 'Bronze'])]
-    temp_df = temp_df.drop_duplicates(subset=['Event_ID', 'Medal'])
+    temp_df = medals[medals['region'] == country]
     
     # Create pivot table
     pt = temp_df.pivot_table(
@@ -137,11 +141,15 @@ def country_event_heatmap(df, country):
         columns='Year',
         values='Medal',
         aggfunc='count',
-        fill_value=0
+        fill_value=0,
+        observed=True
     )
     
     return pt
 
+@profiler.traced
+@memo.memoize
+@backends.dispatch
 def get_sport_stats(df, sport):
     """Get comprehensive statistics for a sport"""
     temp_df = df[df['Sport'] == sport]
@@ -149,22 +157,26 @@ def get_sport_stats(df, sport):
     stats = {
         'first_year': int(temp_df['Year'].min()),
         'events': temp_df['Event'].nunique(),
-        'athletes': temp_df['Name'].nunique(),
+        'athletes': temp_df['ID'].nunique(),
         'nations': temp_df['region'].nunique(),
         'gender_ratio': temp_df['Sex'].value_counts().to_dict()
     }
     
     return stats
 
+@profiler.traced
+@memo.memoize
+@backends.dispatch
 def men_vs_women(df):
     """Analyze gender distribution over time"""
-    athlete_df = df.drop_duplicates(subset=['Name', 'region'])
-    men = athlete_df[athlete_df['Sex'] == 'M'].groupby('Year').count()['Name'].reset_index()
-    women = athlete_df[athlete_df['Sex'] == 'F'].groupby('Year').count()['Name'].reset_index()
+    # Each athlete counted once, in their first Games; frames are Year-sorted
+    athlete_df = df.drop_duplicates(subset=['ID'])
+    men = athlete_df[athlete_df['Sex'] == 'M'].groupby('Year')['ID'].count().reset_index()
+    women = athlete_df[athlete_df['Sex'] == 'F'].groupby('Year')['ID'].count().reset_index()
     
     final = men.merge(women, on='Year', how='left')
     final.fillna(0, inplace=True)
-    final.rename(columns={'Name_x': 'Male', 'Name_y': 'Female'}, inplace=True)
+    final.rename(columns={'ID_x': 'Male', 'ID_y': 'Female'}, inplace=True)
     
     # Calculate percentages
     final['Total'] = final['Male'] + final['Female']
@@ -173,55 +185,91 @@ def men_vs_women(df):
     
     return final
 
+@profiler.traced
+@memo.memoize
+@backends.dispatch
 def weight_v_height(df, sport):
     """Analyze physical attributes with proper handling of duplicates"""
-    # Remove duplicates to get unique athletes
-    athlete_df = df.drop_duplicates(subset=['Name', 'Games', 'Year'])
+    # Remove duplicates to get unique athletes per Games
+    athlete_df = df.drop_duplicates(subset=['ID', 'Games'])
     
     if sport != 'Overall':
         athlete_df = athlete_df[athlete_df['Sport'] == sport]
     
-    # Return only relevant columns with non-null values
-    return athlete_df[['Weight', 'Height', 'Medal', 'Sex', 'Sport']].dropna()
-
-def most_successful_countrywise(df, country):
-    """Find most successful athletes for a country, handling team events correctly"""
-    # Filter for the selected country first
-    temp_df = df[df['region'] == country].copy()
+    # Keep athletes with both measurements (0 is the missing sentinel outside compact mode)
+    athlete_df = athlete_df[['Weight', 'Height', 'Medal', 'Sex', 'Sport']].dropna(subset=['Weight', 'Height'])
+    athlete_df = athlete_df[(athlete_df['Weight'] > 0) & (athlete_df['Height'] > 0)]
     
-    # Filter for actual medals and deduplicate using Event_ID
-    temp_df = temp_df[temp_df['Medal'].isin(['Gold', 'Silver', 'Bronze'])]
-    temp_df = temp_df.drop_duplicates(subset=['Event_ID', 'Medal'])
+    # Non-medallists get an explicit class so they are not dropped by the charts
+    medal = athlete_df['Medal'].astype(object).where(athlete_df['Medal'].notna(), 'No Medal')
+    return athlete_df.assign(Medal=medal.astype(str))
+
+@profiler.traced
+@memo.memoize
+def height_weight_density(df, sport, bins=40):
+    """
+    Bin height vs weight per medal class on the server
     
-    # Count medals per athlete
-    athlete_stats = temp_df.groupby('Name').agg({
+    Parameters:
+        df (pandas.DataFrame): Athlete DataFrame
+        sport (str): Sport name or 'Overall'
+        bins (int): Number of bins along each axis
+        
+    Returns:
+        pandas.DataFrame: Medal, Weight, Height (bin centres), Count and Share
+        (percent of the medal class) for every non-empty bin
+    """
+    athlete_df = weight_v_height(df, sport)
+    weight = athlete_df['Weight'].to_numpy(dtype=float)
+    height = athlete_df['Height'].to_numpy(dtype=float)
+    
+    # Shared edges so the medal classes are directly comparable
+    weight_edges = np.linspace(weight.min(), weight.max(), bins + 1) if len(weight) else np.arange(bins + 1)
+    height_edges = np.linspace(height.min(), height.max(), bins + 1) if len(height) else np.arange(bins + 1)
+    weight_centres = (weight_edges[:-1] + weight_edges[1:]) / 2
+    height_centres = (height_edges[:-1] + height_edges[1:]) / 2
+    
+    frames = []
+    medal = athlete_df['Medal'].to_numpy()
+    for medal_class in ['Gold', 'Silver', 'Bronze', 'No Medal']:
+        mask = medal == medal_class
+        if not mask.any():
+            continue
+        counts, _, _ = np.histogram2d(weight[mask], height[mask], bins=[weight_edges, height_edges])
+        w_idx, h_idx = np.nonzero(counts)
+        frames.append(pd.DataFrame({
+            'Medal': medal_class,
+            'Weight': weight_centres[w_idx].round(1),
+            'Height': height_centres[h_idx].round(1),
+            'Count': counts[w_idx, h_idx].astype(np.int64),
+            'Share': (counts[w_idx, h_idx] / mask.sum() * 100).round(3)
+        }))
+    
+    if not frames:
+        return pd.DataFrame(columns=['Medal', 'Weight', 'Height', 'Count', 'Share'])
+    return pd.concat(frames, ignore_index=True)
+
+@profiler.traced
+@memo.memoize
+@backends.dispatch
+def most_successful_countrywise(medals, country):
+    """Find most successful athletes for a country from the medal fact table"""
+    temp_df = medals[medals['region'] == country]
+    
+    # Count medals per athlete ID, so namesakes stay separate
+    athlete_stats = temp_df.groupby('ID').agg({
+        'Name': 'first',
         'Medal': 'count',
         'Sport': lambda x: ', '.join(sorted(set(x)))
-    }).reset_index()
+    }).reset_index(drop=True)
     
     athlete_stats.columns = ['Name', 'Medals', 'Sport']
     
-    # Sort by medals and get top athletes
-    return athlete_stats.sort_values('Medals', ascending=False).head(10)
+    # Most medals first; groupby sorted by ID and the stable sort keeps ties in ID order
+    return athlete_stats.sort_values('Medals', ascending=False, kind='stable').head(10)
 
-def medal_tally(df):
-    """Calculate overall medal tally with proper handling of team events"""
-    # Remove duplicates for team events by considering unique combinations
-    medal_df = df.drop_duplicates(subset=['Team', 'NOC', 'Games', 'Year', 'Sport', 'Event', 'Medal'])
-    
-    # Filter for rows with medals
-    medal_df = medal_df[medal_df['Medal'].notna()]
-    
-    # Group by region and medal type
-    medal_tally = medal_df.groupby('region')[['Gold', 'Silver', 'Bronze']].sum()
-    
-    # Calculate total
-    medal_tally['Total'] = medal_tally['Gold'] + medal_tally['Silver'] + medal_tally['Bronze']
-    
-    # Sort by total medals, then gold, silver, bronze
-    medal_tally = medal_tally.sort_values(
-        ['Total', 'Gold', 'Silver', 'Bronze'],
-        ascending=[False, False, False, False]
-    ).reset_index()
-    
-    return medal_tally
+@profiler.traced
+@memo.memoize
+def medal_tally(medals):
+    """Calculate overall medal tally from the medal fact table"""
+    return fetch_medal_tally(medals, 'Overall', 'Overall')
@@ -0,0 +1,270 @@
+"""
+Append a new Olympic edition to the stored dataset without reprocessing history
+
+Validates the edition's athlete events against the athlete_events.csv
+schema, preprocesses only the new rows, appends them to the source CSV and
+the compact snapshot, and derives the medal cube, age summaries and cached
+helper results from the delta.
+
+Usage:
+    python incremental.py paris_2024.csv
+"""
+import argparse
+import os
+import shutil
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+import dataset
+import helper
+import memo
+import preprocessor
+
+SEXES = {'M', 'F'}
+SEASONS = {'Summer', 'Winter'}
+MEDALS = {'Gold', 'Silver', 'Bronze'}
+REQUIRED = ['ID', 'Name', 'Sex', 'Team', 'NOC', 'Games', 'Year', 'Season', 'City', 'Sport', 'Event']
+NUMERIC = ['ID', 'Age', 'Height', 'Weight', 'Year']
+
+# Rows per chunk when a snapshot has to be rebuilt, as dataset.load_dataset() reads
+LOAD_CHUNKSIZE = 100_000
+
+
+@dataclass(frozen=True)
+class EditionDelta:
+    """What a new edition touches, used to decide which cached results stay valid"""
+    years: frozenset
+    sports: frozenset
+    medal_regions: frozenset
+    athletes: pd.DataFrame  # compact preprocessed rows of the edition
+
+
+def validate_edition(raw, header, existing):
+    """
+    Check a new edition against the athlete_events.csv schema and history
+
+    Parameters:
+        raw (pandas.DataFrame): Athlete events of the new edition
+        header (list): Columns of athlete_events.csv
+        existing (pandas.DataFrame): Year and Season of every stored row
+
+    Raises:
+        ValueError: Listing every problem found
+    """
+    problems = []
+    missing = [col for col in header if col not in raw.columns]
+    extra = [col for col in raw.columns if col not in header]
+    if missing:
+        problems.append(f'missing columns: {missing}')
+    if extra:
+        problems.append(f'unexpected columns: {extra}')
+    if raw.empty:
+        problems.append('no rows')
+    if problems:
+        raise ValueError('Invalid edition: ' + '; '.join(problems))
+
+    for col in REQUIRED:
+        if raw[col].isna().any():
+            problems.append(f'{col} has {int(raw[col].isna().sum())} missing values')
+    for col in NUMERIC:
+        values = pd.to_numeric(raw[col], errors='coerce')
+        bad = values.isna() & raw[col].notna()
+        if bad.any():
+            problems.append(f'{col} has non-numeric values, e.g. {raw.loc[bad, col].iloc[0]!r}')
+    for col, allowed in [('Sex', SEXES), ('Season', SEASONS), ('Medal', MEDALS)]:
+        unknown = set(raw[col].dropna()) - allowed
+        if unknown:
+            problems.append(f'{col} has unknown values {sorted(unknown)}')
+
+    editions = raw[['Year', 'Season']].drop_duplicates()
+    if len(editions) != 1:
+        problems.append(f'expected one edition, found {len(editions)}')
+    stored = set(existing[['Year', 'Season']].drop_duplicates().itertuples(index=False))
+    for year, season in editions.itertuples(index=False):
+        if (year, season) in stored:
+            problems.append(f'{year} {season} is already stored')
+
+    if problems:
+        raise ValueError('Invalid edition: ' + '; '.join(problems))
+
+
+def keep_cached(delta):
+    """
+    Rule for memo.carry_forward(): which helper results survive the edition
+
+    Results filtered to years, countries or sports the edition does not
+    touch are kept as they are; participation counts get the edition's
+    year appended; everything else is recomputed on demand.
+    """
+    def update(name, args, result):
+        if name == 'helper.fetch_medal_tally':
+            _, year, country = args
+            untouched_year = year != 'Overall' and int(year) not in delta.years
+            untouched_country = country != 'Overall' and country not in delta.medal_regions
+            return result if untouched_year or untouched_country else None
+        if name in ('helper.yearwise_medal_tally', 'helper.country_event_heatmap',
+                    'helper.most_successful_countrywise'):
+            return result if args[1] not in delta.medal_regions else None
+        if name == 'helper.medal_tally':
+            return result if not delta.medal_regions else None
+        if name in ('helper.get_sport_stats', 'helper.weight_v_height', 'helper.height_weight_density'):
+            sport = args[1]
+            return result if sport != 'Overall' and sport not in delta.sports else None
+        if name == 'helper.data_over_time' and len(args) == 2:
+            # Distinct counts per Year only depend on that year's rows
+            added = helper.data_over_time(delta.athletes, args[1])
+            return pd.concat([result, added]).sort_values('Year', kind='stable').reset_index(drop=True)
+        return None
+
+    return update
+
+
+def append_edition(edition_path, athlete_path='athlete_events.csv', region_path='noc_regions.csv',
+                   snapshot_dir='.snapshots', data=None):
+    """
+    Add one edition to the source CSV, the compact snapshot and a Dataset
+
+    Only the edition's rows are preprocessed. The source CSV is replaced
+    atomically by a copy with the edition appended, and the new snapshot
+    is stored under the new source fingerprint, so the next
+    dataset.load_dataset() (or refresh() in a running app) takes the
+    fast path.
+
+    Parameters:
+        edition_path (str): CSV of the new edition in the athlete_events.csv schema
+        athlete_path (str): Stored athlete events CSV, appended to in place
+        region_path (str): CSV with NOC region mappings
+        snapshot_dir (str): Directory for preprocessor snapshots
+        data (Dataset): Already loaded dataset for the current sources; if None the
+            stored snapshot is read and the combined rows are derived once
+
+    Returns:
+        Dataset: Dataset including the edition, with unaffected cached
+        results carried over from data
+    """
+    raw = pd.read_csv(edition_path)
+    header = list(pd.read_csv(athlete_path, nrows=0).columns)
+    existing = pd.read_csv(athlete_path, usecols=['Year', 'Season'])
+    validate_edition(raw, header, existing)
+
+    history = None
+    if data is None:
+        # Nothing derived to extend: read the stored rows only, before the CSV changes
+        history = preprocessor.load_preprocessed(athlete_path, region_path, snapshot_dir, True,
+                                                 chunksize=LOAD_CHUNKSIZE)
+
+    # preprocess() labels Summer rows by position in the file; the edition's continue the count
+    added = preprocessor.compact(preprocessor.preprocess(raw[header], pd.read_csv(region_path)))
+    added.index += int((existing['Season'] == 'Summer').sum())
+
+    _append_csv(edition_path, raw, header, athlete_path)
+    version = preprocessor.source_fingerprint(athlete_path, region_path)
+
+    if data is None:
+        athletes = preprocessor.concat_compact([history, added]).sort_values('Year', kind='stable')
+        extended = dataset.build_dataset(athletes, version)
+    else:
+        extended = _extend(data, added, version)
+    preprocessor.write_snapshot(extended.athletes, snapshot_dir, True, version)
+    return extended
+
+
+def refresh(data, athlete_path='athlete_events.csv', region_path='noc_regions.csv', snapshot_dir='.snapshots'):
+    """
+    The dataset for the current source files, given the one loaded before them
+
+    For long-running processes such as the app, whose loaded Dataset
+    goes stale when append_edition() runs elsewhere. If the sources only
+    gained editions, the new rows are read from the snapshot that
+    append_edition() stored, applied to data as a delta, and its cached
+    results are carried forward; any other change is a full load.
+
+    Parameters:
+        data (Dataset): Dataset loaded from earlier versions of the same files
+        athlete_path (str): CSV with athlete events data
+        region_path (str): CSV with NOC region mappings
+        snapshot_dir (str): Directory for preprocessor snapshots
+
+    Returns:
+        Dataset: data itself if the sources are unchanged, else the current dataset
+    """
+    version = preprocessor.source_fingerprint(athlete_path, region_path)
+    if version == data.version:
+        return data
+    athletes = preprocessor.load_preprocessed(athlete_path, region_path, snapshot_dir, True, key=version,
+                                              chunksize=LOAD_CHUNKSIZE)
+
+    # Only Summer rows are kept, so a Year not loaded before marks an added edition
+    new = ~athletes['Year'].isin(data.athletes['Year'].unique())
+    kept = athletes['ID'].to_numpy()[~new.to_numpy()]
+    if not new.any() or not np.array_equal(kept, data.athletes['ID'].to_numpy()):
+        return dataset.build_dataset(athletes, version)
+    return _extend(data, athletes[new], version)
+
+
+def _extend(data, added, version):
+    """extend_dataset() plus carrying data's cached results forward to the new version"""
+    extended = dataset.extend_dataset(data, added, version)
+    delta = EditionDelta(
+        years=frozenset(int(y) for y in added['Year'].unique()),
+        sports=frozenset(added['Sport'].astype(str).unique()),
+        medal_regions=frozenset(preprocessor.medal_events(added)['region'].astype(str).unique()),
+        athletes=added
+    )
+    memo.carry_forward(
+        {f'{data.version}:athletes': f'{version}:athletes', f'{data.version}:medals': f'{version}:medals'},
+        keep_cached(delta)
+    )
+    return extended
+
+
+def _append_csv(edition_path, raw, header, athlete_path):
+    """Append the edition's rows to the source CSV via a copy swapped in atomically"""
+    tmp_path = f'{athlete_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    shutil.copyfile(athlete_path, tmp_path)
+    try:
+        with open(tmp_path, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+        if list(raw.columns) == header:
+            # Same layout: copy the edition's lines verbatim, minus its header
+            with open(edition_path, 'rb') as src, open(tmp_path, 'ab') as dst:
+                src.readline()
+                shutil.copyfileobj(src, dst)
+        else:
+            raw[header].to_csv(tmp_path, mode='a', header=False, index=False)
+        os.replace(tmp_path, athlete_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('edition', help='CSV of the new edition')
+    parser.add_argument('--athletes', default='athlete_events.csv')
+    parser.add_argument('--regions', default='noc_regions.csv')
+    parser.add_argument('--snapshot-dir', default='.snapshots')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        data = append_edition(args.edition, args.athletes, args.regions, args.snapshot_dir)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f'Appended {args.edition}: {len(data.athletes):,} rows, version {data.version}, '
+          f'{time.perf_counter() - start:.1f}s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,297 @@
+import copy
+import functools
+import os
+import sys
+import threading
+import time
+import warnings
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import backends
+
+# Default budget, overridable per deployment via environment or configure()
+DEFAULT_MAX_ENTRIES = int(os.environ.get('OLYMPICS_MEMO_MAX_ENTRIES', 512))
+DEFAULT_MAX_BYTES = int(os.environ.get('OLYMPICS_MEMO_MAX_MB', 256)) * 1024 * 1024
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # key -> (value, nbytes), least recently used first
+_registry = {}  # id(frame) -> (weakref to frame, version token)
+_limits = {'max_entries': DEFAULT_MAX_ENTRIES, 'max_bytes': DEFAULT_MAX_BYTES}
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bypasses': 0, 'compute_seconds': 0.0}
+_bytes = 0
+
+# Private buffers of pandas' numpy-backed arrays (NumpyExtensionArray, Categorical,
+# masked arrays) that freeze() locks; _locked() checks the result, whatever the layout
+_BUFFER_ATTRS = ('_ndarray', '_codes', '_data', '_mask')
+_unlockable = set()  # array types freeze() has already warned about
+
+
+def configure(max_entries=None, max_bytes=None):
+    """
+    Set the cache budget; entries are evicted least recently used first
+
+    Parameters:
+        max_entries (int): Maximum number of cached results
+        max_bytes (int): Maximum estimated size of all cached results
+    """
+    with _lock:
+        if max_entries is not None:
+            _limits['max_entries'] = max_entries
+        if max_bytes is not None:
+            _limits['max_bytes'] = max_bytes
+        _evict()
+
+
+def register(frame, version):
+    """
+    Make a shared DataFrame usable as a cache key
+
+    Memoized functions only cache calls whose DataFrame arguments are
+    registered; any other frame (a filtered slice, say) runs uncached.
+
+    Parameters:
+        frame (pandas.DataFrame): Shared, read-only frame
+        version (str): Token identifying its contents, e.g. dataset version + table name
+    """
+    key = id(frame)
+    with _lock:
+        _registry[key] = (weakref.ref(frame, lambda _: _registry.pop(key, None)), version)
+
+
+def freeze(df):
+    """
+    Mark the arrays behind a DataFrame or Series as non-writable
+
+    In-place value writes (df.loc[...] = x, .values[...] = x) then raise
+    ValueError instead of silently changing data every session sees.
+    Column assignment and inplace=True methods rebind arrays rather than
+    writing into them and are not caught, so shared frames must be
+    filtered or copied before being modified.
+
+    Arrow-backed arrays are immutable already. An array type exposing none
+    of the known buffers (a later pandas layout, say) cannot be locked:
+    freeze() warns once per type, and memoized results holding one are
+    handed out as deep copies instead of views.
+
+    Parameters:
+        df (pandas.DataFrame): Frame (or Series) to freeze, modified in place
+
+    Returns:
+        pandas.DataFrame: The same frame
+    """
+    # Column views of a 2D block don't reach the block array itself through .base,
+    # so the manager's block arrays are locked too where pandas exposes them
+    blocks = [arr for arr in getattr(getattr(df, '_mgr', None), 'arrays', []) if isinstance(arr, np.ndarray)]
+    for arr in _arrays(df):
+        buffers = _buffers(arr)
+        if not buffers and not isinstance(arr, pd.arrays.ArrowExtensionArray):
+            _warn_unlockable(type(arr))
+        for buf in buffers + blocks:
+            # Views share memory with their base, so lock the whole chain
+            while isinstance(buf, np.ndarray):
+                buf.flags.writeable = False
+                buf = buf.base
+    return df
+
+
+def memoize(func):
+    """
+    Cache results of a helper keyed on (backend, dataset version, function, arguments)
+
+    Every caller gets its own handle on a cached result: frames and
+    arrays are read-only views of the frozen cached data, containers are
+    copies, so a caller modifying its result cannot change what other
+    sessions are served.
+    """
+    name = f'{func.__module__}.{func.__qualname__}'
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = _make_key(name, args, kwargs)
+        if key is None:
+            with _lock:
+                _stats['bypasses'] += 1
+            return func(*args, **kwargs)
+
+        global _bytes
+        with _lock:
+            if key in _entries:
+                _entries.move_to_end(key)
+                _stats['hits'] += 1
+                return _handout(_entries[key][0])
+            _stats['misses'] += 1
+
+        start = time.perf_counter()
+        result = _protect(func(*args, **kwargs))
+        elapsed = time.perf_counter() - start
+
+        nbytes = _nbytes(result)
+        with _lock:
+            _stats['compute_seconds'] += elapsed
+            if nbytes <= _limits['max_bytes'] and key not in _entries:
+                _entries[key] = (result, nbytes)
+                _bytes += nbytes
+                _evict()
+        return _handout(result)
+
+    return wrapper
+
+
+def carry_forward(tokens, update):
+    """
+    Re-key cached results from old frame versions to their successors
+
+    For data that only grew, results the growth did not change can stay
+    warm. Every entry whose key references an old version is offered to
+    update(name, args, result), where args are the key's argument parts
+    with frames as ('frame', old version); it returns the result to cache
+    under the new versions, or None to let the entry lapse.
+
+    Parameters:
+        tokens (dict): Old version token -> new version token
+        update (callable): Decides, and if needed patches, each result
+
+    Returns:
+        int: Number of results carried forward
+    """
+    global _bytes
+    with _lock:
+        candidates = [(key, value) for key, (value, _) in _entries.items()
+                      if any(part[0] == 'frame' and part[1] in tokens
+                             for part in key[1:] if isinstance(part, tuple) and len(part) == 2)]
+
+    carried = 0
+    for key, value in candidates:
+        # update() may run helpers, so it is called without holding the lock
+        result = update(key[1], key[2:], value)
+        if result is None:
+            continue
+        new_key = tuple(
+            ('frame', tokens.get(part[1], part[1]))
+            if isinstance(part, tuple) and len(part) == 2 and part[0] == 'frame' else part
+            for part in key
+        )
+        result = _protect(result)
+        nbytes = _nbytes(result)
+        with _lock:
+            if new_key not in _entries:
+                _entries[new_key] = (result, nbytes)
+                _bytes += nbytes
+                carried += 1
+            _evict()
+    return carried
+
+
+def stats():
+    """Current counters plus cache size, for display in the app"""
+    with _lock:
+        return dict(_stats, entries=len(_entries), bytes=_bytes, **_limits)
+
+
+def clear():
+    """Drop all cached results and reset counters"""
+    global _bytes
+    with _lock:
+        _entries.clear()
+        _bytes = 0
+        for name in _stats:
+            _stats[name] = 0.0 if name == 'compute_seconds' else 0
+
+
+def _make_key(name, args, kwargs):
+    # The engine is part of the key, so switching backends never serves the other engine's results
+    parts = [backends.current(), name]
+    named = [(None, value) for value in args] + sorted(kwargs.items())
+    for arg_name, value in named:
+        if arg_name is not None:
+            parts.append(arg_name)
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            entry = _registry.get(id(value))
+            if entry is None or entry[0]() is not value:
+                return None
+            parts.append(('frame', entry[1]))
+        else:
+            try:
+                hash(value)
+            except TypeError:
+                return None
+            parts.append(value)
+    return tuple(parts)
+
+
+def _protect(value):
+    # Lock the buffers of a result about to be cached
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        freeze(value)
+    elif isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    return value
+
+
+def _handout(value):
+    # Shallow copies share the frozen buffers; writes to them raise or, with
+    # copy-on-write, copy, and column changes stay on the copy. Frames freeze()
+    # could not fully lock get a deep copy, so nothing shared is writable
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not _locked(value))
+    if isinstance(value, np.ndarray):
+        return value.view()
+    if isinstance(value, (list, tuple, dict, set)):
+        return copy.deepcopy(value)
+    return value
+
+
+def _arrays(df):
+    columns = [df] if isinstance(df, pd.Series) else [df[col] for col in df.columns]
+    return [col.array for col in columns] + [df.index.array]
+
+
+def _buffers(arr):
+    return [buf for buf in (getattr(arr, attr, None) for attr in _BUFFER_ATTRS)
+            if isinstance(buf, np.ndarray)]
+
+
+def _locked(df):
+    # Every array either Arrow-backed or with all its known buffers read-only
+    for arr in _arrays(df):
+        if isinstance(arr, pd.arrays.ArrowExtensionArray):
+            continue
+        buffers = _buffers(arr)
+        if not buffers or any(buf.flags.writeable for buf in buffers):
+            return False
+    return True
+
+
+def _warn_unlockable(array_type):
+    with _lock:
+        if array_type in _unlockable:
+            return
+        _unlockable.add(array_type)
+    warnings.warn(f'memo.freeze() cannot lock {array_type.__name__} arrays; '
+                  f'cached results holding them are handed out as copies', RuntimeWarning, stacklevel=3)
+
+
+def _evict():
+    global _bytes
+    while _entries and (len(_entries) > _limits['max_entries'] or _bytes > _limits['max_bytes']):
+        _, (_, nbytes) = _entries.popitem(last=False)
+        _bytes -= nbytes
+        _stats['evictions'] += 1
+
+
+def _nbytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_nbytes(k) + _nbytes(v) for k, v in value.items())
+    return sys.getsizeof(value)
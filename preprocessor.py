@@ -1,13 +1,44 @@
+import glob
+import hashlib
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
+from pandas.api.types import union_categoricals
+
+# Bump whenever preprocess() changes its output so stale snapshots are rebuilt
+PREPROCESSOR_VERSION = '2'
+
+# Low-cardinality columns stored as categoricals in compact mode
+CATEGORY_COLUMNS = ['Sex', 'Team', 'NOC', 'Games', 'Season', 'City', 'Sport', 'Event',
+                    'Medal', 'region', 'notes', 'Event_ID']
+MEDAL_COLUMNS = ['Gold', 'Silver', 'Bronze']
+
+# preprocess_parallel() runs serially on machines with fewer cores than this unless workers is given;
+# process start-up and stitching outweigh the per-year work on small machines
+PARALLEL_MIN_CPUS = int(os.environ.get('OLYMPICS_PARALLEL_MIN_CPUS', 4))
 
-def preprocess(df, df_region):
+# Input of the pool this worker process belongs to, set once by _init_worker()
+_worker_input = {}
+
+# Parse types for the chunked reader; strings stay strings so all-missing chunks do not turn float
+READ_DTYPES = {'ID': 'int32', 'Name': str, 'Sex': str, 'Age': 'float32', 'Height': 'float32',
+               'Weight': 'float32', 'Team': str, 'NOC': str, 'Year': 'int16', 'Season': str,
+               'City': str, 'Sport': str, 'Event': str, 'Medal': str}
+
+def preprocess(df, df_region, compact_dtypes=False, sort=True):
     """
     Preprocess the Olympic data for analysis
     
     Parameters:
     df: DataFrame with athlete events data
     df_region: DataFrame with NOC region mappings
+    compact_dtypes: Return the compact representation from compact()
+    sort: Sort by Year; preprocess_chunked() sorts once after concatenating
     
     Returns:
     Preprocessed DataFrame
@@ -15,8 +46,8 @@ def preprocess(df, df_region):
     # Keep only Summer Olympics
     df = df[df['Season'] == 'Summer']
     
-    # Convert region names to string before merge
-    df_region['region'] = df_region['region'].astype(str)
+    # Convert region names to string before merge (on a copy, the caller's frame may be shared)
+    df_region = df_region.assign(region=df_region['region'].astype(str))
     
     # Merge with region data
     df = df.merge(df_region, on='NOC', how='left')
@@ -52,7 +83,328 @@ def preprocess(df, df_region):
     for col in string_columns:
         df[col] = df[col].astype(str)
     
-    # Sort values by Year for better visualization
-    df = df.sort_values('Year')
+    # Sort values by Year for better visualization - stable, so rows of a
+    # year keep file order and appending an edition never reorders history
+    if sort:
+        df = df.sort_values('Year', kind='stable')
+    
+    if compact_dtypes:
+        df = compact(df)
+    
+    return df
+
+def medal_events(df):
+    """
+    Build the medal fact table - one row per medal per event per nation
+    
+    Team events are collapsed here and nowhere else: every athlete row of a
+    team shares Event_ID, region and Medal, so only the first is kept.
+    
+    Parameters:
+    df: Output of preprocess()
+    
+    Returns:
+    DataFrame with the columns of df, medal rows only
+    """
+    medals = df[df['Medal'].isin(['Gold', 'Silver', 'Bronze'])]
+    return medals.drop_duplicates(subset=['Event_ID', 'region', 'Medal'])
+
+def compact(df):
+    """
+    Convert a preprocessed DataFrame to compact dtypes
+    
+    Low-cardinality strings become categoricals, Name becomes a pyarrow
+    string, Year/ID get small integer widths, medal flags become bools
+    (1 byte, but sums still widen to int64) and the 0 sentinel in
+    Age/Height/Weight becomes a proper missing value.
+    
+    Parameters:
+    df: Output of preprocess()
+    
+    Returns:
+    DataFrame with the same columns and rows
+    """
+    df = df.copy()
+    
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    df['Name'] = df['Name'].astype('string[pyarrow]')
+    
+    df['ID'] = df['ID'].astype('int32')
+    df['Year'] = df['Year'].astype('int16')
+    for col in MEDAL_COLUMNS:
+        df[col] = df[col].astype(bool)
+    
+    # 0 was only ever a stand-in for "unknown"
+    df['Age'] = df['Age'].mask(df['Age'] == 0).astype('UInt8')
+    df['Height'] = df['Height'].mask(df['Height'] == 0).astype('Float32')
+    df['Weight'] = df['Weight'].mask(df['Weight'] == 0).astype('Float32')
+    
+    return df
+
+def preprocess_chunked(athlete_path, region_path, chunksize=100_000):
+    """
+    Low-memory equivalent of compact(preprocess(pd.read_csv(...)))
+    
+    Reads the athlete CSV in chunks with explicit dtypes, skipping Games
+    (rebuilt from Year and City), and filters, merges and compacts each
+    chunk before reading the next, so the full object-dtype frame never
+    exists. Duplicates spanning chunks and the Year sort are resolved once
+    at the end, giving the same rows in the same order as preprocess().
+    
+    Parameters:
+    athlete_path: CSV with athlete events data
+    region_path: CSV with NOC region mappings
+    chunksize: Rows per chunk
+    
+    Returns:
+    Compact preprocessed DataFrame
+    """
+    df_region = pd.read_csv(region_path)
+    header = list(pd.read_csv(athlete_path, nrows=0).columns)
+    usecols = [col for col in header if col != 'Games']
+    
+    chunks = []
+    offset = 0  # Summer rows so far - preprocess() labels them 0..n-1 in file order
+    reader = pd.read_csv(athlete_path, usecols=usecols, dtype=READ_DTYPES, chunksize=chunksize)
+    for raw in reader:
+        summer = int((raw['Season'] == 'Summer').sum())
+        if summer:
+            chunk = compact(preprocess(raw, df_region, sort=False))
+            chunk.index += offset
+            chunks.append(chunk)
+        offset += summer
+    
+    if not chunks:
+        return compact(preprocess(pd.read_csv(athlete_path, nrows=0), df_region))
+    
+    df = concat_compact(chunks)
+    del chunks
+    
+    # Team rows split across chunks, then the same Year sort as preprocess()
+    df = df.drop_duplicates(subset=['Team', 'NOC', 'Games', 'Event', 'Medal'])
+    df = df.sort_values('Year', kind='stable')
+    
+    # Games back in its source position
+    return df[header + [col for col in df.columns if col not in header]]
+
+def preprocess_parallel(df, df_region, compact_dtypes=False, workers=None):
+    """
+    Parallel equivalent of preprocess(), partitioned by Year
+    
+    Duplicates never cross editions (Games is part of the key) and the
+    sort is by Year alone, so every year is preprocessed on its own in a
+    process pool and the results are stitched together in year order,
+    which makes the final sort unnecessary. Output matches preprocess().
+    
+    Parameters:
+    df: DataFrame with athlete events data
+    df_region: DataFrame with NOC region mappings
+    compact_dtypes: Return the compact representation from compact()
+    workers: Number of processes; 1 runs in-process. Default os.cpu_count(), or 1 below PARALLEL_MIN_CPUS cores
+    
+    Returns:
+    Preprocessed DataFrame
+    """
+    summer = df[df['Season'] == 'Summer']
+    if summer.empty:
+        return preprocess(df, df_region, compact_dtypes)
+    
+    # Row positions among Summer rows per year, in file order - the labels preprocess() gives them
+    order = np.argsort(summer['Year'].to_numpy(), kind='stable')
+    bounds = np.flatnonzero(np.diff(summer['Year'].to_numpy()[order])) + 1
+    partitions = np.split(order, bounds)
+    
+    if workers is None:
+        cpus = os.cpu_count() or 1
+        workers = cpus if cpus >= PARALLEL_MIN_CPUS else 1
+    if workers == 1:
+        # Partitioning only pays for itself across processes
+        return preprocess(df, df_region, compact_dtypes)
+    
+    # Each worker receives the frame once at start-up (inherited when forked); tasks carry row positions only
+    fork = 'fork' in multiprocessing.get_all_start_methods()
+    with ProcessPoolExecutor(max_workers=min(workers, len(partitions)),
+                             mp_context=multiprocessing.get_context('fork') if fork else None,
+                             initializer=_init_worker, initargs=(summer, df_region)) as pool:
+        # Biggest years first so the slowest partition does not start last
+        futures = {}
+        for i in sorted(range(len(partitions)), key=lambda i: -len(partitions[i])):
+            futures[pool.submit(_preprocess_partition, partitions[i], compact_dtypes)] = i
+        results = [None] * len(partitions)
+        for future, i in futures.items():
+            results[i] = future.result()
+    return _stitch(results, compact_dtypes)
+
+def _init_worker(summer, df_region):
+    _worker_input.update(summer=summer, df_region=df_region)
+
+def _preprocess_partition(positions, compact_dtypes):
+    summer, df_region = _worker_input['summer'], _worker_input['df_region']
+    df = preprocess(summer.iloc[positions], df_region, compact_dtypes, sort=False)
+    df.index = positions[df.index]
+    return df
+
+def _stitch(results, compact_dtypes):
+    return concat_compact(results) if compact_dtypes else pd.concat(results)
+
+def concat_compact(frames):
+    """
+    Concatenate compact frames, keeping categorical columns categorical
+    
+    Each frame has its own categories; they are unioned and sorted, as
+    astype('category') on the combined data would, so the result matches
+    compacting the concatenation.
+    
+    Parameters:
+    frames: List of outputs of compact() with the same columns
+    
+    Returns:
+    Concatenated DataFrame
+    """
+    frames = list(frames)
+    for col in CATEGORY_COLUMNS:
+        if col in frames[0].columns:
+            categories = union_categoricals([frame[col] for frame in frames], sort_categories=True).categories
+            frames = [frame.assign(**{col: frame[col].cat.set_categories(categories)}) for frame in frames]
+    return pd.concat(frames)
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process so far
+    
+    Returns:
+    Megabytes, or None where the resource module is unavailable
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+def memory_report(before, after):
+    """
+    Print bytes per column for two versions of the same DataFrame
+    
+    Parameters:
+    before: DataFrame before compaction
+    after: DataFrame after compaction
+    
+    Returns:
+    DataFrame with Before, After and Ratio per column plus a Total row
+    """
+    report = pd.DataFrame({
+        'Before': before.memory_usage(deep=True, index=False),
+        'After': after.memory_usage(deep=True, index=False)
+    }).fillna(0).astype(int)
+    report.loc['Total'] = report.sum()
+    report['Ratio'] = (report['After'] / report['Before']).round(3)
+    
+    print(report.to_string())
+    return report
+
+def source_fingerprint(*paths, version=PREPROCESSOR_VERSION):
+    """
+    Content hash identifying a preprocessed snapshot
+    
+    Parameters:
+    paths: Source CSV files feeding preprocess()
+    version: Preprocessor version mixed into the hash
+    
+    Returns:
+    Short hex digest
+    """
+    digest = hashlib.sha256(version.encode())
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+def load_preprocessed(athlete_path='athlete_events.csv', region_path='noc_regions.csv',
+                      snapshot_dir='.snapshots', compact_dtypes=False, key=None, chunksize=None,
+                      workers=None):
+    """
+    Load the preprocessed data from a Parquet snapshot, rebuilding it when stale
+    
+    Parameters:
+    athlete_path: CSV with athlete events data
+    region_path: CSV with NOC region mappings
+    snapshot_dir: Directory holding snapshots keyed by source_fingerprint()
+    compact_dtypes: Load the compact representation from compact()
+    key: Precomputed source_fingerprint() of the two files, if already known
+    chunksize: Rebuild with preprocess_chunked() in chunks of this many rows (compact_dtypes only)
+    workers: Rebuild with preprocess_parallel() on this many processes; takes precedence over chunksize
+    
+    Returns:
+    Preprocessed DataFrame
+    """
+    name = 'compact' if compact_dtypes else 'preprocessed'
+    if key is None:
+        key = source_fingerprint(athlete_path, region_path)
+    snapshot = os.path.join(snapshot_dir, f'{name}-{key}.parquet')
+    
+    # Fast path - snapshot for these exact sources already exists
+    if os.path.exists(snapshot):
+        try:
+            return pd.read_parquet(snapshot)
+        except Exception:
+            pass  # Partial or unreadable snapshot, rebuild below
+    
+    if workers:
+        df = preprocess_parallel(pd.read_csv(athlete_path), pd.read_csv(region_path), compact_dtypes, workers)
+    elif compact_dtypes and chunksize:
+        df = preprocess_chunked(athlete_path, region_path, chunksize)
+    else:
+        df = preprocess(pd.read_csv(athlete_path), pd.read_csv(region_path), compact_dtypes)
+    
+    write_snapshot(df, snapshot_dir, compact_dtypes, key)
+    return df
+
+def write_snapshot(df, snapshot_dir, compact_dtypes, key):
+    """
+    Store a preprocessed DataFrame as the snapshot for key, replacing older ones
+    
+    Parameters:
+    df: Preprocessed DataFrame
+    snapshot_dir: Directory holding snapshots
+    compact_dtypes: Whether df is the compact representation
+    key: source_fingerprint() of the sources df was built from
+    
+    Returns:
+    True if written, False when the write failed (no Parquet engine, read-only
+    disk, unserializable column); the snapshot is only a cache, so failures
+    never propagate
+    """
+    name = 'compact' if compact_dtypes else 'preprocessed'
+    snapshot = os.path.join(snapshot_dir, f'{name}-{key}.parquet')
+    # Unique per process and thread: sessions of one server can cold-load at once
+    tmp_path = f'{snapshot}.{os.getpid()}.{threading.get_ident()}.tmp'
+    
+    # Write to a temp file first so readers never see a half-written snapshot
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, snapshot)
+    except Exception:
+        return False
+    finally:
+        # Only left behind when the write or rename failed
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
+    # Drop snapshots of older sources
+    for path in glob.glob(os.path.join(snapshot_dir, f'{name}-*.parquet')):
+        if path != snapshot:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
     
-    return df
\ No newline at end of file
+    return True
@@ -0,0 +1,104 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+# Opt in for every rerun without the sidebar toggle, e.g. in headless runs
+ENABLED_BY_DEFAULT = os.environ.get('OLYMPICS_PROFILE', '') not in ('', '0')
+DEFAULT_LOG_PATH = os.environ.get('OLYMPICS_PROFILE_LOG', 'profile.jsonl')
+
+
+class _Local(threading.local):
+    run = None  # Class default keeps the disabled check a plain attribute read
+
+
+_local = _Local()  # Streamlit runs each session's script on its own thread
+_null = contextlib.nullcontext()
+
+
+def start_run(enabled):
+    """
+    Begin recording spans for the calling thread's rerun
+
+    Parameters:
+        enabled (bool): Record this rerun; when False span() and traced() are no-ops
+    """
+    _local.run = {'start': time.perf_counter(), 'depth': 0, 'spans': []} if enabled else None
+
+
+def span(name, **fields):
+    """
+    Time a block as one span of the current rerun
+
+    Used as `with profiler.span('figure:...') as s:`; s is a dict the block
+    may add fields to (payload bytes, say), or None when not recording.
+
+    Parameters:
+        name (str): Stage name
+        **fields: Extra fields stored with the span
+    """
+    run = _local.run
+    if run is None:
+        return _null
+    return _span(run, name, fields)
+
+
+@contextlib.contextmanager
+def _span(run, name, fields):
+    record = {'name': name, 'depth': run['depth'], **fields}
+    run['spans'].append(record)  # Appended on entry so the list is in call order
+    run['depth'] += 1
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        end = time.perf_counter()
+        run['depth'] -= 1
+        record['offset_ms'] = round((start - run['start']) * 1000, 3)
+        record['ms'] = round((end - start) * 1000, 3)
+
+
+def traced(func):
+    """Record every call of func as a span named after it"""
+    name = f'{func.__module__}.{func.__qualname__}'
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        run = _local.run
+        if run is None:
+            return func(*args, **kwargs)
+        with _span(run, name, {}):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def finish_run(**meta):
+    """
+    Stop recording and summarise the calling thread's rerun
+
+    Parameters:
+        **meta: Extra fields stored with the report, e.g. the selected page
+
+    Returns:
+        dict: timestamp, total_ms, meta fields and the list of spans, or
+        None when the rerun was not recorded
+    """
+    run = _local.run
+    if run is None:
+        return None
+    _local.run = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'total_ms': round((time.perf_counter() - run['start']) * 1000, 3),
+        **meta,
+        'spans': run['spans']
+    }
+
+
+def export(report, path=DEFAULT_LOG_PATH):
+    """Append one finished rerun to a JSON-lines log"""
+    with open(path, 'a') as f:
+        f.write(json.dumps(report, default=str) + '\n')
@@ -0,0 +1,242 @@
+"""
+Benchmark full page reruns of app.py through Streamlit's headless test harness
+
+Drives every sidebar menu with representative selections (every year in
+the Medal Tally, the top 20 countries, every sport), timing each rerun
+end to end and counting the elements it emits and their serialized size.
+
+The app is pointed at --athletes (by default synthetic_events.csv,
+generated by synthetic.py when missing) through OLYMPICS_ATHLETES.
+
+Usage:
+    python render_benchmark.py --output render_before.json
+    python render_benchmark.py --output render_after.json --compare render_before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import aggregates
+import dataset
+import synthetic
+import warmup
+
+PAGES = ['Medal Tally', 'Overall Analysis', 'Country Analysis', 'Athlete Analysis', 'Sport Analysis']
+TOP_COUNTRIES = 20
+
+
+def elements(node):
+    """Leaf elements under a block of AppTest's public element tree (at.main, at.sidebar)"""
+    children = getattr(node, 'children', None)
+    if children is None:
+        yield node
+        return
+    for child in children.values():
+        yield from elements(child)
+
+
+def measure_rerun(at):
+    """
+    Run the script once and describe what it emitted
+
+    Returns:
+        dict: ms (wall time of the rerun), elements, bytes (serialized
+        element protos), charts, chart_bytes and exceptions
+    """
+    start = time.perf_counter()
+    at.run()
+    ms = (time.perf_counter() - start) * 1000
+
+    kinds = Counter()
+    sizes = Counter()
+    for element in (e for root in (at.main, at.sidebar) for e in elements(root)):
+        proto = getattr(element, 'proto', None)
+        kind = type(proto).__name__ if proto is not None else type(element).__name__
+        kinds[kind] += 1
+        sizes[kind] += proto.ByteSize() if proto is not None else 0
+
+    return {
+        'ms': round(ms, 3),
+        'elements': sum(kinds.values()),
+        'bytes': sum(sizes.values()),
+        'charts': kinds['PlotlyChart'],
+        'chart_bytes': sizes['PlotlyChart'],
+        'exceptions': [e.message for e in at.exception]
+    }
+
+
+def selectbox(at, label):
+    return next(s for s in at.selectbox if s.label == label)
+
+
+def page_selections(at, page, top_countries, limit=None):
+    """
+    Selections to render on a page, as {selectbox label: option index}
+
+    The page must already be rendered so its selectboxes exist.
+    """
+    def indices(label, wanted=None):
+        options = selectbox(at, label).options
+        chosen = [i for i, o in enumerate(options) if wanted is None or o in wanted]
+        return chosen[:limit] if limit else chosen
+
+    if page == 'Medal Tally':
+        return [{'Select Year': i} for i in indices('Select Year')]
+    if page == 'Country Analysis':
+        return [{'Select Country': i} for i in indices('Select Country', ['Overall'] + top_countries)]
+    if page == 'Athlete Analysis':
+        return [{'Select Sport': i, 'Select Sport for Physical Analysis': i} for i in indices('Select Sport')]
+    if page == 'Sport Analysis':
+        return [{'Select Sport': i} for i in indices('Select Sport')]
+    return [{}]
+
+
+def run(app_path, athlete_path, repeat=1, limit=None, timeout=300, log=print):
+    """
+    Render every page selection repeat times
+
+    The first rerun of a selection is cold for the shared result cache,
+    later ones are warm.
+
+    Returns:
+        list: One dict per rerun
+    """
+    # Same source files and snapshot as app.load_data()
+    os.environ['OLYMPICS_ATHLETES'] = athlete_path
+    data = dataset.load_dataset(athlete_path, 'noc_regions.csv', compact_dtypes=True)
+    tally = aggregates.query_medal_tally(data.medal_cube, 'Overall', 'Overall')
+    top_countries = tally['region'].head(TOP_COUNTRIES).tolist()
+
+    # First rerun loads the data and builds the shared Dataset; not a page measurement
+    at = AppTest.from_file(os.path.abspath(app_path), default_timeout=timeout)
+    startup = measure_rerun(at)
+    log(f"startup {startup['ms']:,.0f} ms")
+    results = []
+
+    for page in PAGES:
+        menu = at.sidebar.radio[0]
+        menu.set_value(next(o for o in menu.options if o.endswith(page)))
+        at.run()
+
+        for selection in page_selections(at, page, top_countries, limit):
+            labels = []
+            for label, index in selection.items():
+                box = selectbox(at, label)
+                box.select_index(index)
+                labels.append(str(box.options[index]))
+            for i in range(repeat):
+                result = {'page': page, 'selection': ' / '.join(dict.fromkeys(labels)) or '-',
+                          'run': i, **measure_rerun(at)}
+                results.append(result)
+                log(f"  {page:<18} {result['selection'][:28]:<28} {'cold' if i == 0 else 'warm'} "
+                    f"{result['ms']:>9.1f} ms  {result['elements']:>4} elements  "
+                    f"{result['bytes'] / 1e3:>9.1f} kB" + ('  EXCEPTION' if result['exceptions'] else ''))
+
+    return results
+
+
+def summarize(results):
+    """Per-page cold/warm latency and payload, keyed by page"""
+    pages = {}
+    for page in PAGES:
+        runs = [r for r in results if r['page'] == page]
+        if not runs:
+            continue
+        cold = [r['ms'] for r in runs if r['run'] == 0]
+        warm = [r['ms'] for r in runs if r['run'] > 0]
+        pages[page] = {
+            'selections': len(cold),
+            'cold_median_ms': round(statistics.median(cold), 3),
+            'cold_p95_ms': round(float(np.percentile(cold, 95)), 3),
+            'cold_max_ms': round(max(cold), 3),
+            'warm_median_ms': round(statistics.median(warm), 3) if warm else None,
+            'median_elements': statistics.median(r['elements'] for r in runs),
+            'median_kb': round(statistics.median(r['bytes'] for r in runs) / 1e3, 3),
+            'exceptions': sum(bool(r['exceptions']) for r in runs)
+        }
+    return pages
+
+
+def compare(pages, baseline, threshold):
+    """
+    Pages whose cold median grew by more than threshold relative to baseline
+
+    Returns:
+        list: (page, baseline median, current median) per regression
+    """
+    regressions = []
+    for page, summary in pages.items():
+        before = baseline['pages'].get(page, {}).get('cold_median_ms')
+        if before and summary['cold_median_ms'] > before * (1 + threshold):
+            regressions.append((page, before, summary['cold_median_ms']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--app', default='app.py')
+    parser.add_argument('--athletes', default=synthetic.DEFAULT_OUTPUT,
+                        help='Athlete events CSV; the default is generated by synthetic.py when missing')
+    parser.add_argument('--repeat', type=int, default=2, help='Reruns per selection; the first is cold')
+    parser.add_argument('--limit', type=int, help='At most this many options per selectbox')
+    parser.add_argument('--timeout', type=float, default=300, help='Seconds before a rerun is abandoned')
+    parser.add_argument('--output', default='render_results.json')
+    parser.add_argument('--compare', help='Earlier results JSON to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Flag cold medians slower than baseline by more than this fraction')
+    parser.add_argument('--warmup', choices=warmup.MODES, default='off',
+                        help="Cache warm-up at app start; 'off' keeps first reruns cold")
+    args = parser.parse_args(argv)
+
+    # The app runs in this process, so its warm-up reads these module defaults;
+    # benchmark selections are not real traffic and stay out of the log
+    warmup.DEFAULT_MODE = args.warmup
+    warmup.DEFAULT_TRAFFIC_LOG = ''
+
+    if args.athletes == synthetic.DEFAULT_OUTPUT:
+        synthetic.ensure(args.athletes)
+    results = run(args.app, args.athletes, args.repeat, args.limit, args.timeout)
+    pages = summarize(results)
+    for page, summary in pages.items():
+        print(f"{page:<18} cold median {summary['cold_median_ms']:>9.1f} ms  "
+              f"p95 {summary['cold_p95_ms']:>9.1f} ms  warm median "
+              f"{summary['warm_median_ms'] or float('nan'):>9.1f} ms  {summary['median_kb']:>9.1f} kB")
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'streamlit': st.__version__,
+            'machine': platform.machine(),
+            'repeat': args.repeat,
+            'limit': args.limit,
+            'warmup': args.warmup
+        },
+        'pages': pages,
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Wrote {args.output}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(pages, json.load(f), args.threshold)
+        for page, before, after in regressions:
+            print(f'REGRESSION {page}: {before:.1f} ms -> {after:.1f} ms')
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
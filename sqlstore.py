@@ -0,0 +1,308 @@
+"""
+SQLite engine for the helpers, selected with backends.configure('sqlite')
+
+The helpers receive the Dataset's frames; each function here answers from
+the store attach() linked to that frame and returns NotImplemented for any
+other frame, so backends.dispatch() runs the pandas version instead.
+
+This is an alternative engine over data already in RAM, not an out-of-core
+one: the app still loads the full Dataset (frames, cubes, profiles) and the
+store is an extra on-disk copy next to it, so memory use does not go down.
+"""
+import glob
+import os
+import sqlite3
+import threading
+import weakref
+from dataclasses import dataclass
+
+import pandas as pd
+
+import preprocessor
+
+# Columns filtered on by the helpers; every query narrows on one of them first
+INDEXED_COLUMNS = ['region', 'Year', 'Sport', 'ID']
+
+_local = threading.local()  # One read-only connection per thread and store file
+_lock = threading.Lock()
+_attached = {}  # id(frame) -> (weakref to frame, SQLStore)
+
+
+@dataclass(frozen=True)
+class SQLStore:
+    """Preprocessed data in an SQLite file; hashable by value so helpers can be memoized on it"""
+    path: str
+    version: str
+
+
+def load_store(athlete_path='athlete_events.csv', region_path='noc_regions.csv',
+               store_dir='.snapshots', chunksize=100_000):
+    """
+    Open the SQLite store for the source files, building it when missing
+
+    The CSV is streamed in chunks, so building the file adds no second
+    in-memory copy of the dataset.
+
+    Parameters:
+        athlete_path (str): CSV with athlete events data
+        region_path (str): CSV with NOC region mappings
+        store_dir (str): Directory for store files keyed by source fingerprint
+        chunksize (int): Rows per chunk while building
+
+    Returns:
+        SQLStore: Store for these exact sources; stores of older sources are deleted
+    """
+    version = preprocessor.source_fingerprint(athlete_path, region_path)
+    path = os.path.join(store_dir, f'olympics-{version}.sqlite')
+    if not os.path.exists(path):
+        os.makedirs(store_dir, exist_ok=True)
+        df_region = pd.read_csv(region_path)
+        chunks = (
+            preprocessor.compact(preprocessor.preprocess(raw, df_region, sort=False))
+            for raw in pd.read_csv(athlete_path, dtype=preprocessor.READ_DTYPES, chunksize=chunksize)
+        )
+        _build(path, chunks, dedup=True)
+
+    # Drop stores of older sources; open connections keep reading their file until closed
+    for old in glob.glob(os.path.join(store_dir, 'olympics-*.sqlite')):
+        if old != path:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+    return SQLStore(path=path, version=version)
+
+
+def build_store(athletes, path, version):
+    """
+    Write an already preprocessed DataFrame to an SQLite store
+
+    Parameters:
+        athletes (pandas.DataFrame): Output of preprocessor.preprocess()
+        path (str): Store file to create, replacing any existing one
+        version (str): Token identifying the contents of athletes
+
+    Returns:
+        SQLStore: The new store
+    """
+    _build(path, [athletes], dedup=False)
+    return SQLStore(path=path, version=version)
+
+
+def _build(path, chunks, dedup):
+    # Build beside the target and swap in, so readers never open a half-built file
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        for chunk in chunks:
+            if len(chunk):
+                chunk.to_sql('athletes', conn, if_exists='append', index=False, chunksize=50_000)
+
+        # rowid is file order; team rows split across chunks keep their first occurrence
+        if dedup:
+            conn.execute('''
+                DELETE FROM athletes WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, ROW_NUMBER() OVER (
+                            PARTITION BY Team, NOC, Games, Event, Medal ORDER BY rowid
+                        ) AS n FROM athletes
+                    ) WHERE n > 1
+                )
+            ''')
+
+        # Medal fact table, as preprocessor.medal_events(): first row per event, nation and medal
+        conn.execute('''
+            CREATE TABLE medals AS SELECT * FROM athletes WHERE rowid IN (
+                SELECT MIN(rowid) FROM athletes WHERE Medal IS NOT NULL
+                GROUP BY Event_ID, region, Medal
+            ) ORDER BY Year, rowid
+        ''')
+        for table in ('athletes', 'medals'):
+            for col in INDEXED_COLUMNS:
+                conn.execute(f'CREATE INDEX {table}_{col} ON {table} ({col})')
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+
+def attach(data, store):
+    """
+    Answer the helpers' calls on data's frames from store
+
+    Parameters:
+        data (Dataset): Loaded dataset
+        store (SQLStore): Store built from the same sources
+
+    Returns:
+        Dataset: data, for chaining
+
+    Raises:
+        ValueError: If the store holds another version of the data
+    """
+    if store.version != data.version:
+        raise ValueError(f'Store version {store.version} does not match dataset version {data.version}')
+    with _lock:
+        for frame in (data.athletes, data.medals):
+            key = id(frame)
+            _attached[key] = (weakref.ref(frame, lambda _, key=key: _attached.pop(key, None)), store)
+    return data
+
+
+def store_for(frame):
+    """The store attach() linked to frame, or None"""
+    entry = _attached.get(id(frame))
+    return entry[1] if entry is not None and entry[0]() is frame else None
+
+
+def query(store, sql, params=()):
+    """Run a read-only query on the calling thread's connection to store"""
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(store.path)
+    if conn is None:
+        conn = connections[store.path] = sqlite3.connect(f'file:{store.path}?mode=ro', uri=True)
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def fetch_medal_tally(medals, year, country):
+    """Medal tally for a year and/or country; same frame as helper.fetch_medal_tally"""
+    store = store_for(medals)
+    if store is None:
+        return NotImplemented
+    where, params = [], []
+    if year != 'Overall':
+        where.append('Year = ?')
+        params.append(int(year))
+    if country != 'Overall':
+        where.append('region = ?')
+        params.append(country)
+
+    return query(store, f'''
+        SELECT region, SUM(Gold) AS Gold, SUM(Silver) AS Silver, SUM(Bronze) AS Bronze,
+               SUM(Gold) + SUM(Silver) + SUM(Bronze) AS Total
+        FROM medals {'WHERE ' + ' AND '.join(where) if where else ''}
+        GROUP BY region
+        ORDER BY Total DESC, Gold DESC, Silver DESC, Bronze DESC, region
+    ''', params)
+
+
+def data_over_time(df, col):
+    """Distinct values of col per Year; same frame as helper.data_over_time"""
+    store = store_for(df)
+    if store is None:
+        return NotImplemented
+    if col == 'Countries':
+        col = 'region'
+    columns = query(store, 'SELECT name FROM pragma_table_info(?)', ('athletes',))['name'].tolist()
+    if col not in columns:
+        raise ValueError(f"Column '{col}' not found in DataFrame")
+
+    return query(store, f'''
+        SELECT Year, COUNT(DISTINCT "{col}") AS Count FROM athletes GROUP BY Year ORDER BY Year
+    ''')
+
+
+def yearwise_medal_tally(medals, country):
+    """Medals per Year for a country; same frame as helper.yearwise_medal_tally"""
+    store = store_for(medals)
+    if store is None:
+        return NotImplemented
+    return query(store, '''
+        SELECT Year, COUNT(*) AS Medals FROM medals WHERE region = ? GROUP BY Year ORDER BY Year
+    ''', (country,))
+
+
+def country_event_heatmap(medals, country):
+    """Medals per Sport and Year for a country; same pivot as helper.country_event_heatmap"""
+    store = store_for(medals)
+    if store is None:
+        return NotImplemented
+    counts = query(store, '''
+        SELECT Sport, Year, COUNT(*) AS Medals FROM medals WHERE region = ? GROUP BY Sport, Year
+    ''', (country,))
+    return counts.pivot(index='Sport', columns='Year', values='Medals').fillna(0).astype('int64')
+
+
+def most_successful_countrywise(medals, country):
+    """Top 10 medallists of a country; same frame as helper.most_successful_countrywise"""
+    store = store_for(medals)
+    if store is None:
+        return NotImplemented
+    counts = query(store, '''
+        SELECT ID, MIN(Name) AS Name, Sport, COUNT(*) AS Medals FROM medals WHERE region = ?
+        GROUP BY ID, Sport ORDER BY ID, Sport
+    ''', (country,))
+    athlete_stats = counts.groupby('ID').agg(
+        Name=('Name', 'first'),
+        Medals=('Medals', 'sum'),
+        Sport=('Sport', ', '.join)
+    ).reset_index(drop=True)
+    return athlete_stats.sort_values('Medals', ascending=False, kind='stable').head(10)
+
+
+def get_sport_stats(df, sport):
+    """Headline numbers for a sport; same dict as helper.get_sport_stats"""
+    store = store_for(df)
+    if store is None:
+        return NotImplemented
+    stats = query(store, '''
+        SELECT MIN(Year) AS first_year, COUNT(DISTINCT Event) AS events,
+               COUNT(DISTINCT ID) AS athletes, COUNT(DISTINCT region) AS nations
+        FROM athletes WHERE Sport = ?
+    ''', (sport,)).iloc[0]
+    gender = query(store, '''
+        SELECT Sex, COUNT(*) AS n FROM athletes WHERE Sport = ? GROUP BY Sex ORDER BY n DESC
+    ''', (sport,))
+    return {
+        'first_year': int(stats['first_year']),
+        'events': int(stats['events']),
+        'athletes': int(stats['athletes']),
+        'nations': int(stats['nations']),
+        'gender_ratio': dict(zip(gender['Sex'], gender['n'].astype(int)))
+    }
+
+
+def men_vs_women(df):
+    """Athletes per Year by sex, each counted once; same frame as helper.men_vs_women"""
+    store = store_for(df)
+    if store is None:
+        return NotImplemented
+    final = query(store, '''
+        WITH first AS (
+            SELECT Year, Sex, ROW_NUMBER() OVER (PARTITION BY ID ORDER BY Year, rowid) AS n
+            FROM athletes
+        )
+        SELECT Year, SUM(Sex = 'M') AS Male, SUM(Sex = 'F') AS Female
+        FROM first WHERE n = 1
+        GROUP BY Year HAVING Male > 0
+        ORDER BY Year
+    ''')
+    final['Total'] = final['Male'] + final['Female']
+    final['Male %'] = round((final['Male'] / final['Total'] * 100), 2)
+    final['Female %'] = round((final['Female'] / final['Total'] * 100), 2)
+    return final
+
+
+def weight_v_height(df, sport):
+    """Athletes with both measurements, once per Games; same rows as helper.weight_v_height"""
+    store = store_for(df)
+    if store is None:
+        return NotImplemented
+    # First row per athlete and Games decides the sport; only athletes of the sport can qualify
+    by_sport = sport != 'Overall'
+    return query(store, f'''
+        WITH first AS (
+            SELECT Weight, Height, Medal, Sex, Sport, Year, rowid AS row,
+                   ROW_NUMBER() OVER (PARTITION BY ID, Games ORDER BY Year, rowid) AS n
+            FROM athletes
+            {'WHERE ID IN (SELECT ID FROM athletes WHERE Sport = ?)' if by_sport else ''}
+        )
+        SELECT Weight, Height, COALESCE(Medal, 'No Medal') AS Medal, Sex, Sport
+        FROM first
+        WHERE n = 1 AND Weight > 0 AND Height > 0 {'AND Sport = ?' if by_sport else ''}
+        ORDER BY Year, row
+    ''', (sport, sport) if by_sport else ())
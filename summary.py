@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Distinct values counted per edition for the participation trends
+TREND_COLUMNS = ['region', 'Event', 'ID', 'Sport', 'City']
+
+
+@dataclass(frozen=True)
+class DatasetSummary:
+    """Headline numbers and small page-level tables, computed once per dataset version"""
+    editions: int
+    host_cities: int
+    sports: int
+    events: int
+    athletes: int
+    nations: int
+    sport_names: list  # sorted, for the sport selectors
+    participation: pd.DataFrame  # Year plus distinct counts per TREND_COLUMNS entry
+    events_per_sport: pd.Series  # distinct events per sport, ascending
+    events_heatmap: pd.DataFrame  # Sport x Year row counts
+
+
+def participation_trends(athletes, athlete_index):
+    """
+    Distinct regions, events, athletes, sports and cities per edition in one pass
+
+    Every column shares one Year index and is counted by marking
+    (edition, value) pairs, instead of a drop_duplicates() and groupby
+    per column as helper.data_over_time() does.
+
+    Parameters:
+        athletes (pandas.DataFrame): Output of preprocessor.preprocess()
+        athlete_index (AthleteIndex): Index built over athletes
+
+    Returns:
+        pandas.DataFrame: Year plus one count column per TREND_COLUMNS
+        entry; each Year/column pair equals helper.data_over_time()
+    """
+    year = athletes['Year'].to_numpy()
+    years = np.sort(pd.unique(year))
+    year_idx = np.searchsorted(years, year)
+
+    trends = {'Year': years}
+    for col in TREND_COLUMNS:
+        if col == 'ID':
+            trends[col] = _athletes_per_year(year_idx, len(years), athlete_index)
+        else:
+            trends[col] = _distinct_per_year(year_idx, len(years), athletes[col])
+    return pd.DataFrame(trends)
+
+
+def _distinct_per_year(year_idx, n_years, values):
+    # Category codes (or factorized values) mark a dense edition x value grid; -1 is missing
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, n_values = values.cat.codes.to_numpy(), len(values.cat.categories)
+    else:
+        codes, uniques = pd.factorize(values)
+        n_values = len(uniques)
+    present = codes >= 0
+    seen = np.zeros((n_years, n_values), dtype=bool)
+    seen[year_idx[present], codes[present]] = True
+    return seen.sum(axis=1)
+
+
+def _athletes_per_year(year_idx, n_years, athlete_index):
+    # Each athlete's rows are contiguous and in Year order, so a new (athlete, edition)
+    # pair starts wherever the edition changes or the next athlete begins
+    years = year_idx[athlete_index.rows]
+    first = np.ones(len(years), dtype=bool)
+    first[1:] = years[1:] != years[:-1]
+    first[athlete_index.starts[:-1]] = True
+    return np.bincount(years[first], minlength=n_years)
+
+
+def build_summary(athletes, athlete_index):
+    """
+    Summarize a preprocessed athlete frame for the overview pages
+
+    Parameters:
+        athletes (pandas.DataFrame): Output of preprocessor.preprocess()
+        athlete_index (AthleteIndex): Index built over athletes
+
+    Returns:
+        DatasetSummary: Everything the Overall Analysis page and the
+        Sport Analysis overview render
+    """
+    sport_names = sorted(athletes['Sport'].dropna().unique().tolist())
+
+    return DatasetSummary(
+        editions=athletes['Year'].nunique(),
+        host_cities=athletes['City'].nunique(),
+        sports=len(sport_names),
+        events=athletes['Event'].nunique(),
+        athletes=len(athlete_index.ids),
+        nations=athletes['region'].nunique(),
+        sport_names=sport_names,
+        participation=participation_trends(athletes, athlete_index),
+        events_per_sport=athletes.groupby('Sport', observed=True)['Event'].nunique().sort_values(ascending=True),
+        events_heatmap=athletes.pivot_table(
+            index='Sport', columns='Year', values='Event', aggfunc='count', fill_value=0, observed=True
+        )
+    )
@@ -0,0 +1,404 @@
+"""
+Deterministic synthetic athlete_events.csv generator for load and scale testing
+
+Writes files with the athlete_events.csv schema (ID, Name, Sex, Age,
+Height, Weight, Team, NOC, Games, Year, Season, City, Sport, Event,
+Medal), one Games edition at a time so memory stays flat for any size.
+The same seed and row count always produce the same file.
+
+Usage:
+    python synthetic.py --rows 5000000 --seed 7 --output synthetic_events.csv
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Gitignored file the benchmarks generate on first use
+DEFAULT_OUTPUT = 'synthetic_events.csv'
+
+COLUMNS = ['ID', 'Name', 'Sex', 'Age', 'Height', 'Weight', 'Team', 'NOC', 'Games',
+           'Year', 'Season', 'City', 'Sport', 'Event', 'Medal']
+
+SUMMER_HOSTS = {
+    1896: 'Athina', 1900: 'Paris', 1904: 'St. Louis', 1906: 'Athina', 1908: 'London',
+    1912: 'Stockholm', 1920: 'Antwerpen', 1924: 'Paris', 1928: 'Amsterdam',
+    1932: 'Los Angeles', 1936: 'Berlin', 1948: 'London', 1952: 'Helsinki',
+    1956: 'Melbourne', 1960: 'Roma', 1964: 'Tokyo', 1968: 'Mexico City', 1972: 'Munich',
+    1976: 'Montreal', 1980: 'Moskva', 1984: 'Los Angeles', 1988: 'Seoul',
+    1992: 'Barcelona', 1996: 'Atlanta', 2000: 'Sydney', 2004: 'Athina', 2008: 'Beijing',
+    2012: 'London', 2016: 'Rio de Janeiro'
+}
+WINTER_HOSTS = {
+    1924: 'Chamonix', 1928: 'Sankt Moritz', 1932: 'Lake Placid', 1936: 'Garmisch-Partenkirchen',
+    1948: 'Sankt Moritz', 1952: 'Oslo', 1956: "Cortina d'Ampezzo", 1960: 'Squaw Valley',
+    1964: 'Innsbruck', 1968: 'Grenoble', 1972: 'Sapporo', 1976: 'Innsbruck',
+    1980: 'Lake Placid', 1984: 'Sarajevo', 1988: 'Calgary', 1992: 'Albertville',
+    1994: 'Lillehammer', 1998: 'Nagano', 2002: 'Salt Lake City', 2006: 'Torino',
+    2010: 'Vancouver', 2014: 'Sochi'
+}
+
+# (sport, season, events, team size, first year); team size 1 is an individual event
+SPORTS = [
+    ('Athletics', 'Summer', 47, 1, 1896), ('Swimming', 'Summer', 34, 1, 1896),
+    ('Gymnastics', 'Summer', 18, 1, 1896), ('Rowing', 'Summer', 14, 4, 1900),
+    ('Cycling', 'Summer', 18, 1, 1896), ('Fencing', 'Summer', 10, 1, 1896),
+    ('Wrestling', 'Summer', 18, 1, 1896), ('Boxing', 'Summer', 13, 1, 1904),
+    ('Shooting', 'Summer', 15, 1, 1896), ('Sailing', 'Summer', 10, 2, 1900),
+    ('Weightlifting', 'Summer', 15, 1, 1896), ('Canoeing', 'Summer', 16, 2, 1936),
+    ('Equestrianism', 'Summer', 6, 1, 1900), ('Judo', 'Summer', 14, 1, 1964),
+    ('Diving', 'Summer', 8, 1, 1904), ('Archery', 'Summer', 4, 1, 1900),
+    ('Hockey', 'Summer', 2, 11, 1908), ('Football', 'Summer', 2, 11, 1900),
+    ('Basketball', 'Summer', 2, 12, 1936), ('Volleyball', 'Summer', 2, 12, 1964),
+    ('Handball', 'Summer', 2, 14, 1972), ('Water Polo', 'Summer', 2, 13, 1900),
+    ('Tennis', 'Summer', 5, 1, 1896), ('Table Tennis', 'Summer', 4, 1, 1988),
+    ('Badminton', 'Summer', 5, 1, 1992), ('Modern Pentathlon', 'Summer', 2, 1, 1912),
+    ('Taekwondo', 'Summer', 8, 1, 2000), ('Triathlon', 'Summer', 2, 1, 2000),
+    ('Beach Volleyball', 'Summer', 2, 2, 1996), ('Rugby Sevens', 'Summer', 2, 12, 2016),
+    ('Alpine Skiing', 'Winter', 10, 1, 1936), ('Cross Country Skiing', 'Winter', 12, 1, 1924),
+    ('Speed Skating', 'Winter', 12, 1, 1924), ('Figure Skating', 'Winter', 4, 1, 1924),
+    ('Ice Hockey', 'Winter', 2, 22, 1924), ('Biathlon', 'Winter', 11, 1, 1960),
+    ('Bobsleigh', 'Winter', 3, 4, 1924), ('Ski Jumping', 'Winter', 4, 1, 1924),
+    ('Luge', 'Winter', 4, 1, 1964), ('Curling', 'Winter', 2, 4, 1998)
+]
+# Sports awarding two bronze medals per event
+TWO_BRONZES = {'Boxing', 'Judo', 'Wrestling', 'Taekwondo'}
+
+# Historically large delegations first; the rest follow in noc_regions.csv order
+MAJOR_NOCS = ['USA', 'GBR', 'FRA', 'GER', 'ITA', 'CAN', 'JPN', 'AUS', 'SWE', 'NED', 'HUN',
+              'RUS', 'URS', 'CHN', 'ESP', 'POL', 'SUI', 'KOR', 'BRA', 'ROU', 'FIN', 'NOR',
+              'AUT', 'CZE', 'BEL', 'ARG', 'DEN', 'MEX', 'GRE', 'BUL']
+
+FIRST_NAMES = {
+    'M': ['John', 'Paul', 'Hans', 'Pierre', 'Giuseppe', 'Ivan', 'Carlos', 'Li', 'Hiroshi', 'Lars',
+          'Michael', 'David', 'Peter', 'Andrei', 'Jan', 'Jose', 'Mohamed', 'Ahmed', 'James', 'Karl',
+          'Luis', 'Marco', 'Sergei', 'Thomas', 'Wei', 'Kenji', 'Erik', 'Jozef', 'Antonio', 'George'],
+    'F': ['Mary', 'Anna', 'Maria', 'Elena', 'Sofia', 'Olga', 'Yuki', 'Li', 'Emma', 'Ingrid',
+          'Sarah', 'Laura', 'Katarina', 'Irina', 'Ana', 'Fatima', 'Jennifer', 'Eva', 'Marie', 'Chen',
+          'Natalia', 'Giulia', 'Agnes', 'Helen', 'Hanna', 'Keiko', 'Birgit', 'Zsuzsa', 'Lucia', 'Grace']
+}
+LAST_NAMES = ['Smith', 'Johnson', 'Muller', 'Martin', 'Rossi', 'Ivanov', 'Garcia', 'Wang', 'Sato',
+              'Andersson', 'Brown', 'Schmidt', 'Dubois', 'Bianchi', 'Petrov', 'Rodriguez', 'Zhang',
+              'Suzuki', 'Nielsen', 'Taylor', 'Fischer', 'Bernard', 'Romano', 'Smirnov', 'Lopez', 'Li',
+              'Tanaka', 'Hansen', 'Wilson', 'Weber', 'Moreau', 'Colombo', 'Kuznetsov', 'Perez', 'Liu',
+              'Watanabe', 'Johansson', 'Nagy', 'Kowalski', 'Novak', 'Horvat', 'Silva', 'Kim', 'Park',
+              'Jensen', 'Virtanen', 'Popescu', 'Dimitrov', 'Papadopoulos', 'Yilmaz']
+
+# Athlete slots per (NOC, sport, sex, edition window); returning athletes reuse the previous window
+SLOTS = 64
+WINDOWS = 512
+RETURN_RATE = 0.3
+
+# Share of athlete_events.csv rows with a medal (39,783 of 271,116); fields are sized to match it
+MEDAL_SHARE = 0.147
+
+
+def editions(extra_editions=0):
+    """(year, season, city) for every edition, plus optional synthetic future ones"""
+    result = [(y, 'Summer', c) for y, c in SUMMER_HOSTS.items()]
+    result += [(y, 'Winter', c) for y, c in WINTER_HOSTS.items()]
+    for k in range(1, extra_editions + 1):
+        result.append((2016 + 4 * k, 'Summer', f'Host City {2016 + 4 * k}'))
+        result.append((2014 + 4 * k, 'Winter', f'Host City {2014 + 4 * k}'))
+    return sorted(result)
+
+
+def event_catalogue(scale=1.0):
+    """
+    Every event with its sport, sex, team size and the year it was introduced
+
+    Parameters:
+        scale (float): Events per sport relative to SPORTS; extra events
+            follow the introduction schedule of the listed ones
+
+    Returns:
+        pandas.DataFrame: One row per event
+    """
+    rows = []
+    for sport_idx, (sport, season, n_events, team_size, first_year) in enumerate(SPORTS):
+        for i in range(max(n_events, round(n_events * scale))):
+            sex = 'M' if i % 2 == 0 else 'F'
+            # Events join the programme gradually; women's events later
+            introduced = first_year + 4 * ((i % n_events) // 2) + (32 if sex == 'F' else 0)
+            rows.append({
+                'sport_idx': sport_idx,
+                'Sport': sport,
+                'Season': season,
+                'Event': f"{sport} {'Men' if sex == 'M' else 'Women'}'s Event {i // 2 + 1}",
+                'Sex': sex,
+                'team_size': team_size,
+                'introduced': min(introduced, 2016)
+            })
+    return pd.DataFrame(rows)
+
+
+def noc_table(region_path):
+    """NOCs with team names (region) and relative delegation strength"""
+    regions = pd.read_csv(region_path)
+    regions = regions[regions['NOC'].notna()]
+    order = MAJOR_NOCS + [n for n in regions['NOC'] if n not in MAJOR_NOCS]
+    regions = regions.set_index('NOC').reindex(order).reset_index()
+    regions['Team'] = regions['region'].fillna(regions['NOC'])
+    rank = np.arange(len(regions))
+    regions['strength'] = 1.0 / (rank + 2) ** 1.1
+    return regions[['NOC', 'Team', 'strength']]
+
+
+def event_instances(events, extra_editions=0):
+    """Every (edition, event) contested, numbered by edition and by edition within its season"""
+    instances = []
+    season_counter = {}
+    for edition_idx, (year, season, city) in enumerate(editions(extra_editions)):
+        # Returning athletes are tracked per season, so number editions within each season
+        season_idx = season_counter[season] = season_counter.get(season, -1) + 1
+        active = events[(events['Season'] == season) & (events['introduced'] <= year)]
+        instances.append(active.assign(Year=year, City=city, edition_idx=edition_idx,
+                                       season_idx=season_idx))
+    return pd.concat(instances, ignore_index=True)
+
+
+def medal_places(instances):
+    """Medal-winning teams per event instance: three, or four where two bronzes are awarded"""
+    return np.where(instances['Sport'].isin(TWO_BRONZES).to_numpy(), 4, 3)
+
+
+def min_rows(extra_editions=0):
+    """Smallest file plan() can produce: three teams in every event instance"""
+    instances = event_instances(event_catalogue(), extra_editions)
+    return int((3 * instances['team_size']).sum())
+
+
+def plan(rows, seed, extra_editions=0):
+    """
+    Number of competing teams per (edition, event), scaled to exactly rows athlete rows
+
+    Fields are sized so that, as in athlete_events.csv, about MEDAL_SHARE
+    of the rows win a medal; larger files get more events rather than
+    ever larger fields. Below the size where the listed events alone
+    reach that share, fields are thinner and the share is higher.
+
+    Returns:
+        pandas.DataFrame: One row per event instance with Year, Season, City,
+        event columns and n_teams
+
+    Raises:
+        ValueError: If rows is below min_rows()
+    """
+    minimum = min_rows(extra_editions)
+    if rows < minimum:
+        raise ValueError(f'rows must be at least {minimum:,} (three teams in every event), got {rows:,}')
+
+    # Rows at which the listed events give MEDAL_SHARE; more rows add events
+    instances = event_instances(event_catalogue(), extra_editions)
+    natural = (medal_places(instances) * instances['team_size']).sum() / MEDAL_SHARE
+    if rows > natural:
+        instances = event_instances(event_catalogue(rows / natural), extra_editions)
+
+    # Fields grow over time; base intensity is calibrated to the requested size
+    rng = np.random.default_rng([seed, 0])
+    growth = 1 + (instances['Year'].to_numpy() - 1896) / 40
+    per_team = instances['team_size'].to_numpy()
+    base = np.where(per_team == 1, 12.0, 6.0) * growth
+    lam = base * rows / max((base * per_team).sum(), 1)
+    n_teams = np.maximum(rng.poisson(lam), 3)
+
+    # Nudge individual events until the row count is exact; at or above min_rows() this always ends
+    individual = np.flatnonzero(per_team == 1)
+    diff = rows - int((n_teams * per_team).sum())
+    while diff != 0:
+        if diff > 0:
+            np.add.at(n_teams, rng.choice(individual, diff), 1)
+        else:
+            candidates = individual[n_teams[individual] > 3]
+            if len(candidates) == 0:
+                # Only team events are above the minimum; drop one team and top up with individuals
+                candidates = rng.choice(np.flatnonzero(n_teams > 3), 1)
+            picked = rng.choice(candidates, min(-diff, len(candidates)), replace=False)
+            n_teams[picked] -= 1
+        diff = rows - int((n_teams * per_team).sum())
+
+    return instances.assign(n_teams=n_teams)
+
+
+def generate_edition(instances, nocs, seed, row_offset=0):
+    """
+    Athlete rows of one edition
+
+    Parameters:
+        instances (pandas.DataFrame): Rows of plan() for a single edition
+        nocs (pandas.DataFrame): Output of noc_table()
+        seed (int): Base seed; each edition derives its own stream
+        row_offset (int): Rows of the file written before this edition
+
+    Returns:
+        pandas.DataFrame: Rows in the athlete_events.csv schema
+    """
+    year = int(instances['Year'].iloc[0])
+    season = instances['Season'].iloc[0]
+    edition_idx = int(instances['edition_idx'].iloc[0])
+    season_idx = int(instances['season_idx'].iloc[0])
+    rng = np.random.default_rng([seed, 1, edition_idx])
+
+    # Teams: one per (event instance, entrant), NOC drawn by delegation strength
+    n_teams = instances['n_teams'].to_numpy()
+    team_instance = np.repeat(np.arange(len(instances)), n_teams)
+    strength = nocs['strength'].to_numpy()
+    team_noc = rng.choice(len(nocs), len(team_instance), p=strength / strength.sum())
+
+    # Medals go to the first places of an exponential race weighted by strength
+    race = rng.exponential(size=len(team_instance)) / strength[team_noc]
+    order = np.lexsort((race, team_instance))
+    starts = np.concatenate([[0], np.cumsum(n_teams)[:-1]])
+    place = np.empty(len(order), dtype=np.int64)
+    place[order] = np.arange(len(order)) - np.repeat(starts, n_teams)
+    two_bronzes = instances['Sport'].isin(TWO_BRONZES).to_numpy()[team_instance]
+    medal_names = np.array(['Gold', 'Silver', 'Bronze', 'Bronze'], dtype=object)
+    has_medal = (place < 3) | ((place == 3) & two_bronzes)
+    team_medal = np.where(has_medal, medal_names[np.minimum(place, 3)], None)
+
+    # Expand teams into athlete rows
+    team_size = instances['team_size'].to_numpy()[team_instance]
+    row_team = np.repeat(np.arange(len(team_instance)), team_size)
+    row_instance = team_instance[row_team]
+    row_noc = team_noc[row_team]
+    n_rows = len(row_team)
+
+    sport_idx = instances['sport_idx'].to_numpy()[row_instance]
+    is_female = (instances['Sex'].to_numpy()[row_instance] == 'F').astype(np.int64)
+
+    # Stable athlete identity: same (NOC, sport, sex, window, slot) -> same ID across editions.
+    # Slots are dealt without replacement within each (event instance, NOC, window), so no event
+    # lists one athlete twice whichever teams they are entered in. Every event of a sport deals
+    # from the same random start, so a nation's athletes contest several events, as in the source.
+    window = np.maximum(season_idx - (rng.random(n_rows) < RETURN_RATE), 0)
+    squad = ((row_noc * len(SPORTS) + sport_idx) * 2 + is_female) * WINDOWS + window
+    squads, squad_idx = np.unique(squad, return_inverse=True)
+    group = (row_instance * len(nocs) + row_noc) * WINDOWS + window
+    order = np.argsort(group, kind='stable')
+    new_group = np.concatenate([[True], group[order][1:] != group[order][:-1]])
+    group_starts = np.flatnonzero(new_group)
+    group_idx = np.empty(n_rows, dtype=np.int64)
+    group_idx[order] = np.cumsum(new_group) - 1
+    rank = np.empty(n_rows, dtype=np.int64)
+    rank[order] = np.arange(n_rows) - group_starts[group_idx[order]]
+    slot = (rng.integers(0, SLOTS, len(squads))[squad_idx] + rank) % SLOTS
+    athlete_id = squad * SLOTS + slot + 1
+
+    # A NOC fielding more than SLOTS athletes in one event (huge fields at large scales) enters
+    # the rest as one-off athletes, numbered past every slot ID by their row in the file
+    first_one_off = len(nocs) * len(SPORTS) * 2 * WINDOWS * SLOTS + 1
+    athlete_id = np.where(rank < SLOTS, athlete_id, first_one_off + row_offset + np.arange(n_rows))
+
+    # Attributes derived from the ID so a returning athlete keeps them
+    mix = (athlete_id * 2654435761) % (2 ** 32)
+    first = np.where(
+        is_female == 1,
+        np.array(FIRST_NAMES['F'], dtype=object)[mix % len(FIRST_NAMES['F'])],
+        np.array(FIRST_NAMES['M'], dtype=object)[mix % len(FIRST_NAMES['M'])]
+    )
+    initial = np.array([chr(65 + i) for i in range(26)], dtype=object)[(mix // 97) % 26]
+    last = np.array(LAST_NAMES, dtype=object)[(mix // 7919) % len(LAST_NAMES)]
+    name = first + ' ' + initial + '. ' + last
+
+    age = 19 + (mix // 13) % 12 + 4 * (season_idx - window) + rng.integers(0, 2, n_rows)
+    height = 178 - 12 * is_female + ((mix // 31) % 21) - 10 + (sport_idx % 5) * 2
+    weight = np.round(height * (0.40 + ((mix // 101) % 11) / 100) - 5 * is_female)
+
+    # Physical attributes were rarely recorded in early Games; nullable
+    # integers write missing values as NA without float formatting
+    missing_hw = rng.random(n_rows) < np.clip(0.9 - (year - 1896) * 0.0075, 0.05, 0.9)
+    missing_age = rng.random(n_rows) < np.clip(0.25 - (year - 1896) * 0.002, 0.01, 0.25)
+
+    return pd.DataFrame({
+        'ID': athlete_id,
+        'Name': name,
+        'Sex': np.where(is_female == 1, 'F', 'M'),
+        'Age': pd.arrays.IntegerArray(age.astype(np.int64), missing_age),
+        'Height': pd.arrays.IntegerArray(height.astype(np.int64), missing_hw),
+        'Weight': pd.arrays.IntegerArray(weight.astype(np.int64), missing_hw),
+        'Team': nocs['Team'].to_numpy()[row_noc],
+        'NOC': nocs['NOC'].to_numpy()[row_noc],
+        'Games': f'{year} {season}',
+        'Year': year,
+        'Season': season,
+        'City': instances['City'].iloc[0],
+        'Sport': instances['Sport'].to_numpy()[row_instance],
+        'Event': instances['Event'].to_numpy()[row_instance],
+        'Medal': team_medal[row_team]
+    }, columns=COLUMNS)
+
+
+def generate(output, rows=271116, seed=0, region_path='noc_regions.csv', extra_editions=0, log=None):
+    """
+    Write a synthetic athlete events CSV of exactly rows data rows
+
+    Parameters:
+        output (str): Destination CSV path
+        rows (int): Number of athlete-event rows
+        seed (int): Random seed; same seed and rows give the same file
+        region_path (str): noc_regions.csv used for NOCs and team names
+        extra_editions (int): Synthetic Summer/Winter editions after 2016
+        log (callable): Optional progress callback taking a message
+
+    Returns:
+        int: Rows written
+
+    Raises:
+        ValueError: If rows is below min_rows(), before anything is written
+    """
+    instances = plan(rows, seed, extra_editions)
+    nocs = noc_table(region_path)
+    written = 0
+    with open(output, 'w', newline='') as f:
+        for i, (_, edition) in enumerate(instances.groupby('edition_idx', sort=True)):
+            chunk = generate_edition(edition, nocs, seed, row_offset=written)
+            chunk.to_csv(f, header=(i == 0), index=False, na_rep='NA')
+            written += len(chunk)
+            if log:
+                log(f"{edition['Year'].iloc[0]} {edition['Season'].iloc[0]}: {written:,} rows")
+    return written
+
+
+def ensure(output=DEFAULT_OUTPUT, region_path='noc_regions.csv', log=None):
+    """
+    Generate output with the default rows and seed unless it already exists
+
+    Parameters:
+        output (str): CSV path
+        region_path (str): noc_regions.csv used for NOCs and team names
+        log (callable): Optional progress callback taking a message
+
+    Returns:
+        str: output
+    """
+    if not os.path.exists(output):
+        generate(output, region_path=region_path, log=log)
+    return output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=271116)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--regions', default='noc_regions.csv')
+    parser.add_argument('--extra-editions', type=int, default=0)
+    parser.add_argument('--quiet', action='store_true')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        written = generate(args.output, args.rows, args.seed, args.regions, args.extra_editions,
+                           log=None if args.quiet else print)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f'Wrote {written:,} rows to {args.output} in {time.perf_counter() - start:.1f}s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
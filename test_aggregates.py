@@ -0,0 +1,86 @@
+"""
+Gender cube counts against a direct recount of distinct athletes
+
+Run with: python -m pytest -q test_aggregates.py
+"""
+import os
+
+import pandas as pd
+import pytest
+
+import aggregates
+import dataset
+import preprocessor
+import synthetic
+
+REGION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'noc_regions.csv')
+
+
+def recount(athletes, by=()):
+    """Distinct athletes per edition (and by) and sex, shaped like query_gender_trend()"""
+    keys = ['Year', *by]
+    direct = athletes.drop_duplicates([*keys, 'ID']).groupby(['Year', 'Sex'], observed=True).size()
+    direct = direct.unstack(fill_value=0).reindex(columns=['M', 'F'], fill_value=0)
+    direct = direct[direct.sum(axis=1) > 0]
+    return pd.DataFrame({
+        'Year': direct.index.astype('int64'),
+        'Male': direct['M'].to_numpy('int64'),
+        'Female': direct['F'].to_numpy('int64')
+    })
+
+
+def assert_trend(trend, expected):
+    pd.testing.assert_frame_equal(trend[['Year', 'Male', 'Female']].reset_index(drop=True), expected)
+
+
+@pytest.fixture(scope='module')
+def data(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp('gender')
+    path = str(tmp / 'events.csv')
+    synthetic.generate(path, rows=synthetic.min_rows(), region_path=REGION_PATH)
+    return dataset.load_dataset(path, REGION_PATH, snapshot_dir=str(tmp / 'snapshots'))
+
+
+def test_overall_counts_each_athlete_once_per_edition(data):
+    assert_trend(aggregates.query_gender_trend(data.gender_cube), recount(data.athletes))
+
+
+def test_country_counts_each_athlete_once_per_edition(data):
+    athletes = data.athletes.assign(region=data.athletes['region'].astype(str))
+    for country in athletes['region'].value_counts().index[:5]:
+        selected = athletes[athletes['region'] == country]
+        assert_trend(aggregates.query_gender_trend(data.gender_cube, country=country),
+                     recount(selected))
+
+
+def test_sport_counts_each_athlete_once_per_edition(data):
+    athletes = data.athletes.assign(Sport=data.athletes['Sport'].astype(str))
+    for sport in athletes['Sport'].value_counts().index[:5]:
+        selected = athletes[athletes['Sport'] == sport]
+        assert_trend(aggregates.query_gender_trend(data.gender_cube, sport=sport),
+                     recount(selected))
+
+
+def test_athlete_in_several_events_and_sports():
+    # One woman in two swimming events and athletics, one man in two editions;
+    # events differ per row since preprocess() keeps one row per team and event
+    rows = [
+        (1, 'A', 'F', 'Swimming', 'Swimming 100m', 2000),
+        (1, 'A', 'F', 'Swimming', 'Swimming 200m', 2000),
+        (1, 'A', 'F', 'Athletics', 'Athletics 100m', 2000),
+        (2, 'B', 'M', 'Athletics', 'Athletics 400m', 2000),
+        (2, 'B', 'M', 'Athletics', 'Athletics 100m', 2004)
+    ]
+    raw = pd.DataFrame([{
+        'ID': athlete_id, 'Name': name, 'Sex': sex, 'Age': 25.0, 'Height': 180.0, 'Weight': 70.0,
+        'Team': 'France', 'NOC': 'FRA', 'Games': f'{year} Summer', 'Year': year, 'Season': 'Summer',
+        'City': 'Sydney', 'Sport': sport, 'Event': event, 'Medal': None
+    } for athlete_id, name, sex, sport, event, year in rows])
+    data = dataset.build_dataset(preprocessor.preprocess(raw, pd.read_csv(REGION_PATH)), 'test')
+
+    overall = aggregates.query_gender_trend(data.gender_cube)
+    assert overall[['Year', 'Male', 'Female']].values.tolist() == [[2000, 1, 1], [2004, 1, 0]]
+    country = aggregates.query_gender_trend(data.gender_cube, country='France')
+    assert country[['Year', 'Male', 'Female']].values.tolist() == [[2000, 1, 1], [2004, 1, 0]]
+    swimming = aggregates.query_gender_trend(data.gender_cube, sport='Swimming')
+    assert swimming[['Year', 'Male', 'Female']].values.tolist() == [[2000, 0, 1]]
@@ -0,0 +1,190 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import charts
+import helper
+
+# Warm-up scope, overridable per deployment via environment or start() arguments:
+# 'all' warms every selector value, 'top' the TOP_N most requested ones, 'off' nothing
+DEFAULT_MODE = os.environ.get('OLYMPICS_WARMUP', 'all')
+DEFAULT_TOP_N = int(os.environ.get('OLYMPICS_WARMUP_TOP_N', 10))
+DEFAULT_WORKERS = int(os.environ.get('OLYMPICS_WARMUP_WORKERS', 2))
+# Selections the pages record for 'top' mode; an empty value turns recording off
+DEFAULT_TRAFFIC_LOG = os.environ.get('OLYMPICS_TRAFFIC_LOG', 'traffic.jsonl')
+
+MODES = ['off', 'all', 'top']
+
+_record_lock = threading.Lock()
+
+
+@dataclass
+class WarmupStatus:
+    """Progress of one warm-up run, updated from the pool's threads"""
+    mode: str
+    total: int
+    done: int = 0
+    failed: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    seconds: float = None  # total wall time once every task has finished
+
+    @property
+    def finished(self):
+        return self.seconds is not None
+
+
+def selector_domains(data):
+    """
+    Values of the selectors whose pages go through the memo cache
+
+    Only the sport selectors do: the year and country selections of the
+    Medal Tally and Country pages are answered from precomputed cubes and
+    bundles, so warming per year or country would cache nothing.
+
+    Parameters:
+        data (Dataset): Loaded dataset
+
+    Returns:
+        dict: 'sport' -> list of values, 'Overall' first
+    """
+    return {'sport': ['Overall'] + data.summary.sport_names}
+
+
+def record(selection, log_path=None):
+    """
+    Append one rerun's selector values to the traffic log
+
+    Parameters:
+        selection (dict): Selector name -> selected value
+        log_path (str): JSON-lines traffic log, None for DEFAULT_TRAFFIC_LOG; empty to skip recording
+    """
+    log_path = DEFAULT_TRAFFIC_LOG if log_path is None else log_path
+    if not selection or not log_path:
+        return
+    line = json.dumps(selection, default=str) + '\n'
+    # Traffic only steers the warm-up, so an unwritable log must not break a page
+    try:
+        with _record_lock, open(log_path, 'a') as f:
+            f.write(line)
+    except OSError:
+        pass
+
+
+def traffic(log_path=DEFAULT_TRAFFIC_LOG):
+    """
+    Requests per selector value in the traffic log
+
+    Parameters:
+        log_path (str): JSON-lines log written by record()
+
+    Returns:
+        dict: selector name -> Counter of selected values; empty when there is no log
+    """
+    counts = {}
+    try:
+        with open(log_path) as f:
+            for line in f:
+                try:
+                    selection = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(selection, dict):
+                    continue
+                for name, value in selection.items():
+                    counts.setdefault(name, Counter())[str(value)] += 1
+    except OSError:
+        pass
+    return counts
+
+
+def rank(values, counts, top_n):
+    """The top_n values by request count; unrequested values follow in selector order"""
+    order = sorted(range(len(values)), key=lambda i: -counts.get(str(values[i]), 0))
+    return [values[i] for i in order[:top_n]]
+
+
+def tasks(data, domains):
+    """
+    Memoized helper calls the pages make for the given selector values
+
+    The Medal Tally, Country and Sport pages read precomputed cubes and
+    bundles, so only the year/country lists, the overall tally and the
+    sport-keyed physical attribute helpers go through the memo cache.
+
+    Parameters:
+        data (Dataset): Loaded dataset
+        domains (dict): Selector values to warm, as from selector_domains()
+
+    Returns:
+        list: (function, args) pairs
+    """
+    df, medals = data.athletes, data.medals
+    calls = [(helper.country_year_list, (df,)), (helper.medal_tally, (medals,))]
+    for sport in domains['sport']:
+        calls.append((_physical, (df, sport)))
+    return calls
+
+
+def _physical(df, sport):
+    # The density grid is only drawn, and so only worth caching, for large slices
+    if charts.scatter_mode(len(helper.weight_v_height(df, sport))) == 'density':
+        helper.height_weight_density(df, sport)
+
+
+def start(data, mode=None, top_n=DEFAULT_TOP_N, workers=DEFAULT_WORKERS,
+          log_path=DEFAULT_TRAFFIC_LOG):
+    """
+    Fill the memo cache on a background thread pool and return immediately
+
+    Parameters:
+        data (Dataset): Loaded dataset
+        mode (str): One of MODES; None for DEFAULT_MODE
+        top_n (int): Values per selector warmed in 'top' mode
+        workers (int): Pool threads
+        log_path (str): Traffic log ranking the values in 'top' mode
+
+    Returns:
+        WarmupStatus: Live progress of the run
+
+    Raises:
+        ValueError: If mode is not one of MODES
+    """
+    mode = DEFAULT_MODE if mode is None else mode
+    if mode not in MODES:
+        raise ValueError(f"Unknown warm-up mode '{mode}', expected one of {MODES}")
+
+    calls = []
+    if mode != 'off':
+        domains = selector_domains(data)
+        if mode == 'top':
+            counts = traffic(log_path)
+            domains = {name: rank(values, counts.get(name, {}), top_n) for name, values in domains.items()}
+        calls = tasks(data, domains)
+
+    status = WarmupStatus(mode=mode, total=len(calls))
+    if not calls:
+        status.seconds = 0.0
+        return status
+
+    lock = threading.Lock()
+
+    def finish(future):
+        with lock:
+            status.done += 1
+            status.failed += future.exception() is not None
+            if status.done == status.total:
+                status.seconds = time.perf_counter() - status.started
+                print(f'Cache warm-up ({mode}): {status.total} tasks, {status.failed} failed, '
+                      f'{status.seconds:.1f}s', file=sys.stderr)
+
+    # Threads share the process-wide memo cache; shutdown(wait=False) lets the pool drain on its own
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='warmup')
+    for func, args in calls:
+        pool.submit(func, *args).add_done_callback(finish)
+    pool.shutdown(wait=False)
+    return status